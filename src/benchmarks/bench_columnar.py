@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: columnar process store vs. a list of ProcessModel objects
+
+Measures the memory retained by one snapshot's process table and the time
+to build and diff it, against the former list-based diff kept here as the
+baseline. The live process list is cycled up to each target size (with
+distinct PIDs), and both representations share the same string objects,
+as they do when built from the static-attribute cache. Run from the src
+directory:
+
+    python benchmarks/bench_columnar.py [--sizes 1000 10000 50000]
+"""
+
+import argparse
+import dataclasses
+import gc
+import itertools
+import os
+import sys
+import time
+import tracemalloc
+from operator import attrgetter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.columnar import ProcessColumns  # noqa: E402
+from models.diff import DIFF_FIELDS, SnapshotDiff, diff_columns, index_columns  # noqa: E402
+from models.process_model import get_real_processes  # noqa: E402
+
+
+def synthesize(processes, size):
+    """Cycle processes up to size entries, giving each copy a unique PID"""
+    return [
+        dataclasses.replace(proc, pid=index + 1)
+        for index, proc in enumerate(itertools.islice(itertools.cycle(processes), size))
+    ]
+
+
+def index_processes(processes):
+    """The former index: identity key -> ProcessModel"""
+    return {(p.pid, p.create_time): p for p in processes}
+
+
+def diff_processes(old, new, get_values=attrgetter(*DIFF_FIELDS)):
+    """The former diff over lists of ProcessModel, comparing attribute tuples per process"""
+    added = tuple(key for key in new if key not in old)
+    exited = tuple(key for key in old if key not in new)
+
+    changed = {}
+    for key, proc in new.items():
+        prev = old.get(key)
+        if prev is None or prev is proc:
+            continue
+        prev_values = get_values(prev)
+        values = get_values(proc)
+        if prev_values != values:
+            changed[key] = frozenset(
+                name for name, a, b in zip(DIFF_FIELDS, prev_values, values) if a != b
+            )
+
+    return SnapshotDiff(added=added, exited=exited, changed=changed)
+
+
+def measure(build):
+    """Return (result, bytes retained, seconds) for build()"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    live = get_real_processes()
+    ProcessColumns.from_processes(live)  # Warm up NumPy's lazy initialization
+    print(f"Live processes: {len(live)}")
+    print(f"{'rows':>8} {'list (KB)':>10} {'B/row':>7} {'columns (KB)':>13} {'B/row':>7} "
+          f"{'build (s)':>10} {'diff list (s)':>14} {'diff cols (s)':>14}")
+
+    for size in args.sizes:
+        source = synthesize(live, size)
+        # Second tick: every process accumulated a little CPU time
+        source_next = [dataclasses.replace(p, cpu_time_user=p.cpu_time_user + 0.01) for p in source]
+
+        models, list_bytes, _ = measure(lambda: [dataclasses.replace(p) for p in source])
+        columns, column_bytes, build_time = measure(lambda: ProcessColumns.from_processes(source))
+
+        models_next = [dataclasses.replace(p) for p in source_next]
+        columns_next = ProcessColumns.from_processes(source_next)
+
+        old_index, new_index = index_processes(models), index_processes(models_next)
+        started = time.perf_counter()
+        diff_processes(old_index, new_index)
+        list_diff = time.perf_counter() - started
+
+        old_rows, new_rows = index_columns(columns), index_columns(columns_next)
+        started = time.perf_counter()
+        diff_columns(columns, old_rows, columns_next, new_rows)
+        column_diff = time.perf_counter() - started
+
+        print(f"{size:>8} {list_bytes / 1024:>10.0f} {list_bytes / size:>7.0f} "
+              f"{column_bytes / 1024:>13.0f} {column_bytes / size:>7.0f} "
+              f"{build_time:>10.3f} {list_diff:>14.3f} {column_diff:>14.3f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: indexed process tree builder vs. the former quadratic one
+
+Builds a synthetic process forest of each target size (every process is
+parented to a random earlier one, with a few orphans) and times
+build_process_tree. The former builder, which scanned every process for
+the children of each node, is timed up to --legacy-max processes. Run
+from the src directory:
+
+    python benchmarks/bench_process_tree.py [--sizes 1000 5000 50000]
+"""
+
+import argparse
+import dataclasses
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.process_model import build_process_tree, get_real_processes  # noqa: E402
+
+
+def synthesize(template, size, seed=0):
+    """A random forest of size processes; about 1% have an exited parent"""
+    rng = random.Random(seed)
+    processes = [dataclasses.replace(template, pid=1, ppid=0)]
+    for pid in range(2, size + 1):
+        if rng.random() < 0.01:
+            ppid = size + pid  # Parent no longer exists
+        else:
+            # A uniformly random earlier parent keeps the depth near ln(size),
+            # mostly within the former builder's depth limit
+            ppid = rng.randint(1, pid - 1)
+        processes.append(dataclasses.replace(
+            template, pid=pid, ppid=ppid, cpu=rng.random(), rss=rng.randrange(1 << 20, 1 << 28)
+        ))
+    return processes
+
+
+def legacy_build(processes, max_depth=10):
+    """The former builder: a scan of all processes per node, roots by PID only"""
+    roots = [p for p in processes if p.ppid == 0 or p.pid == 1]
+
+    def get_children(parent_pid, depth=0):
+        if depth > max_depth:
+            return []
+        children = []
+        for proc in processes:
+            if proc.ppid == parent_pid:
+                children.append({
+                    'process': proc,
+                    'children': get_children(proc.pid, depth + 1),
+                    'depth': depth
+                })
+        children.sort(key=lambda x: x['process'].cpu, reverse=True)
+        return children
+
+    return [{'process': root, 'children': get_children(root.pid), 'depth': 0} for root in roots]
+
+
+def count(nodes):
+    """Number of nodes in a tree"""
+    total = 0
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        total += 1
+        stack.extend(node['children'])
+    return total
+
+
+def timed(build):
+    """Return (result, seconds) for build()"""
+    started = time.perf_counter()
+    result = build()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 50000])
+    parser.add_argument("--legacy-max", type=int, default=5000,
+                        help="largest size the quadratic builder is timed at")
+    args = parser.parse_args()
+
+    template = get_real_processes()[0]
+    print(f"{'procs':>8} {'indexed (s)':>12} {'nodes':>8} {'legacy (s)':>11} {'nodes':>8} {'speedup':>9}")
+
+    for size in args.sizes:
+        processes = synthesize(template, size)
+        tree, indexed_time = timed(lambda: build_process_tree(processes))
+        line = f"{size:>8} {indexed_time:>12.3f} {count(tree):>8}"
+        if size <= args.legacy_max:
+            legacy, legacy_time = timed(lambda: legacy_build(processes))
+            speedup = legacy_time / indexed_time if indexed_time else float("inf")
+            line += f" {legacy_time:>11.3f} {count(legacy):>8} {speedup:>8.1f}x"
+        else:
+            line += f" {'-':>11} {'-':>8} {'-':>9}"
+        print(line)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
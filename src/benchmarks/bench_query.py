@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: process query engine over snapshots with distinct commands
+
+The live process list is cycled up to each target size with distinct PIDs,
+and every copy gets its own command line (as worker pools with per-worker
+arguments do), so string predicates cannot lean on a small string table.
+Each query is timed cold, on a fresh copy of the snapshot with nothing
+cached, and warm, when run again on the same snapshot; the typing rows
+replay bare words one character at a time through IncrementalSearch.
+Run from the src directory:
+
+    python benchmarks/bench_query.py [--sizes 1000 10000 50000]
+"""
+
+import argparse
+import dataclasses
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.columnar import ProcessColumns  # noqa: E402
+from models.process_model import get_real_processes  # noqa: E402
+from models.query import IncrementalSearch, Query  # noqa: E402
+
+QUERIES = [
+    ("bare word", "python", None),
+    ("pid digits", "42", None),
+    ("regex", 'cmd~"work.*1"', None),
+    ("numeric + sort", "cpu>=0 rss>1M", [("cpu", True)]),
+    ("sort by command", "", [("command", False)]),
+]
+# Typed one character at a time: a selective word, and one in every command
+TYPED = ("python", "worker-id=4")
+
+
+def synthesize(processes, size):
+    """Cycle processes up to size entries, each with a unique PID and command line"""
+    return [
+        dataclasses.replace(proc, pid=index + 1, command=f"{proc.command} --worker-id={index}")
+        for index, proc in enumerate(itertools.islice(itertools.cycle(processes), size))
+    ]
+
+
+def fresh(columns):
+    """The same table with every per-snapshot cache empty"""
+    return ProcessColumns(columns.data, columns.strings)
+
+
+def best(run, repeat=5):
+    """Fastest of repeat runs, in milliseconds"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    live = get_real_processes()
+    print(f"Live processes: {len(live)}")
+    print(f"{'rows':>8} {'strings':>8} {'query':>16} {'cold (ms)':>10} {'warm (ms)':>10} {'matches':>8}")
+
+    for size in args.sizes:
+        columns = ProcessColumns.from_processes(synthesize(live, size))
+        for label, text, sort in QUERIES:
+            query = Query.parse(text)
+            cold = best(lambda: query.run(fresh(columns), sort))
+            query.run(columns, sort)
+            warm = best(lambda: query.run(columns, sort))
+            matches = len(query.run(columns, sort))
+            print(f"{size:>8} {len(columns.strings):>8} {label:>16} {cold:>10.1f} {warm:>10.1f} {matches:>8}")
+
+        # One query per keystroke; every one after the first narrows the last
+        def typing(table, word):
+            search = IncrementalSearch()
+            for end in range(1, len(word) + 1):
+                rows = search.run(table, Query.parse(word[:end]))
+            return rows
+        for word in TYPED:
+            cold = best(lambda: typing(fresh(columns), word))
+            matches = len(typing(columns, word))
+            print(f"{size:>8} {len(columns.strings):>8} {'type ' + word:>16} {cold:>10.1f} {'':>10} {matches:>8}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ PyQt6 Desktop Application
 Main application entry point
 """
 
+import multiprocessing
 import os
 import sys
 
@@ -44,4 +45,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Sharded scan workers are spawned; needed for frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
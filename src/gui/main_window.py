@@ -4,7 +4,7 @@ Main Window for ELPM Application
 
 import os
 
-from PyQt6.QtCore import QSize, Qt, QTimer
+from PyQt6.QtCore import QEvent, QSize, Qt, QTimer
 from PyQt6.QtGui import QColor, QIcon, QPalette
 from PyQt6.QtWidgets import (
     QApplication,
@@ -19,6 +19,7 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from gui.snapshot_service import NETWORK_VIEW, SnapshotService
 from gui.styles import STYLESHEET
 from gui.views.graphs_view import GraphsView
 from gui.views.placeholder_view import PlaceholderView
@@ -45,6 +46,14 @@ class MainWindow(QMainWindow):
         # Set dark palette
         self.set_dark_palette()
 
+        # Single background collector shared by every view; ELPM_CPU_BUDGET
+        # is the fraction of one core refreshing may use
+        self.snapshot_service = SnapshotService(
+            interval=2000,
+            cpu_budget=float(os.environ.get("ELPM_CPU_BUDGET", "0.02")),
+            parent=self,
+        )
+
         # Initialize UI
         self.init_ui()
 
@@ -102,60 +111,99 @@ class MainWindow(QMainWindow):
 
         # Add tabs
         self.history_view = HistoryView()
-        self.processes_view = ProcessesView(history_callback=self.history_view)
+        self.processes_view = ProcessesView(
+            self.snapshot_service, history_callback=self.history_view
+        )
         self.tab_widget.addTab(self.processes_view, "⚡ Processes")
 
-        self.process_tree_view = ProcessTreeView()
+        self.process_tree_view = ProcessTreeView(self.snapshot_service)
         self.tab_widget.addTab(self.process_tree_view, "🌲 Process Tree")
 
-        self.network_view = NetworkView()
+        self.network_view = NetworkView(self.snapshot_service)
         self.tab_widget.addTab(self.network_view, "🌐 Network")
 
-        self.graphs_view = GraphsView()
+        self.graphs_view = GraphsView(self.snapshot_service)
         self.tab_widget.addTab(self.graphs_view, "📊 Graphs")
 
         self.tab_widget.addTab(self.history_view, "🕐 Activity History")
 
         main_layout.addWidget(self.tab_widget)
 
+        # The snapshot service only collects what the shown tab needs
+        self.view_names = {
+            self.processes_view: "processes",
+            self.process_tree_view: "tree",
+            self.network_view: NETWORK_VIEW,
+            self.graphs_view: "graphs",
+            self.history_view: "history",
+        }
+        self.tab_widget.currentChanged.connect(self.update_visible_views)
+        self.update_visible_views()
+
         # Status bar
         self.status_bar_widget = StatusBar()
         main_layout.addWidget(self.status_bar_widget)
 
-        # Connect search functionality
+        # Connect search functionality; history only records settled queries
+        self.last_search_entry = ""
+        self.search_history_timer = QTimer(self)
+        self.search_history_timer.setSingleShot(True)
+        self.search_history_timer.setInterval(1000)
+        self.search_history_timer.timeout.connect(self.commit_search_history)
         self.top_bar.search_changed.connect(self.on_search_changed)
         self.top_bar.refresh_clicked.connect(self.on_refresh_clicked)
         self.top_bar.fullscreen_toggled.connect(self.toggle_fullscreen)
 
     def setup_timers(self):
         """Setup update timers"""
-        # Update status bar every second
+        # Update status bar clock every second
         self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_status_bar)
+        self.status_timer.timeout.connect(self.status_bar_widget.update_clock)
         self.status_timer.start(1000)
 
-        # Process list has its own timer in ProcessesView
-        # Graphs timer
-        self.graph_timer = QTimer()
-        self.graph_timer.timeout.connect(self.graphs_view.update_graphs)
-        self.graph_timer.start(2000)  # Update every 2 seconds
-
-    def update_status_bar(self):
-        """Update status bar with current process count"""
-        process_count = len(self.processes_view.processes)
-        self.status_bar_widget.update_stats(process_count)
+        # All system data comes from the snapshot service
+        self.snapshot_service.subscribe(self.status_bar_widget.update_stats)
+        self.snapshot_service.interval_changed.connect(self.status_bar_widget.update_interval)
+        self.snapshot_service.start()  # Every 2 seconds, stretched under load
+        self.snapshot_service.request_refresh()
 
     def on_search_changed(self, query: str):
-        """Handle search query changes"""
+        """Filter immediately; record the query in history once typing settles"""
         self.processes_view.set_search_text(query)
-        if query.strip():
+        self.search_history_timer.start()
+
+    def commit_search_history(self):
+        """Add the settled search query to the history"""
+        query = self.top_bar.search_input.text().strip()
+        if query and query != self.last_search_entry:
             self.history_view.add_search_entry(query)
+            self.last_search_entry = query
 
     def on_refresh_clicked(self):
         """Handle refresh button click"""
         self.processes_view.refresh_processes()
-        self.graphs_view.update_graphs()
-        self.update_status_bar()
+
+    def update_visible_views(self):
+        """Tell the snapshot service which view is on screen"""
+        name = self.view_names.get(self.tab_widget.currentWidget())
+        self.snapshot_service.set_visible_views({name} if name else set())
+
+    def changeEvent(self, event):
+        """Pause full collection while the window is minimized"""
+        if event.type() == QEvent.Type.WindowStateChange:
+            minimized = self.isMinimized()
+            self.snapshot_service.set_lightweight(minimized)
+            if minimized:
+                self.status_timer.stop()
+            else:
+                self.status_timer.start(1000)
+                self.status_bar_widget.update_clock()
+        super().changeEvent(event)
+
+    def closeEvent(self, event):
+        """Stop background sampling before the window closes"""
+        self.snapshot_service.shutdown()
+        super().closeEvent(event)
 
     def toggle_fullscreen(self):
         """Toggle full screen mode"""
@@ -0,0 +1,196 @@
+"""
+Snapshot service - the single collector all views subscribe to.
+
+Each tick walks /proc once on a background thread and publishes one
+SystemSnapshot (processes, system counters, sockets) to every subscriber.
+The tick interval adapts to what collecting and rendering actually cost.
+"""
+
+import logging
+import time
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+
+from models.scheduler import AdaptiveInterval
+from models.snapshot import collect_snapshot, collect_system_snapshot
+
+log = logging.getLogger(__name__)
+
+# Views that show sockets; connections are only collected while one is visible
+NETWORK_VIEW = "network"
+SOCKET_VIEWS = frozenset((NETWORK_VIEW,))
+
+
+class SnapshotWorker(QObject):
+    """Worker living on the service thread that performs the collection"""
+
+    snapshot_ready = pyqtSignal(object)
+    collect_failed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.seq = 0
+        self.previous = None
+        self.connection_states = None
+        self.lightweight = False
+        self.visible_views = None  # Names of the views on screen, None = all
+
+    def wants_sockets(self) -> bool:
+        """True while a visible view shows connections"""
+        return self.visible_views is None or not self.visible_views.isdisjoint(SOCKET_VIEWS)
+
+    @pyqtSlot()
+    def collect(self):
+        """Collect one snapshot (diffed against the last) and hand it to the GUI thread
+
+        A failed collection is logged and reported through collect_failed;
+        an exception escaping this slot would abort the application.
+        """
+        seq = self.seq + 1
+        try:
+            if self.lightweight and self.previous is not None:
+                snapshot = collect_system_snapshot(seq, self.previous)
+            else:
+                snapshot = collect_snapshot(seq, self.previous, self.connection_states,
+                                            sockets=self.wants_sockets())
+        except Exception as exc:
+            log.exception("Snapshot collection failed")
+            self.collect_failed.emit(str(exc) or type(exc).__name__)
+            return
+        # Sequence numbers only advance with published snapshots, so the
+        # next diff still lines up with what the views show
+        self.seq = seq
+        self.previous = snapshot
+        self.snapshot_ready.emit(snapshot)
+
+
+class SnapshotService(QObject):
+    """Schedules collections on a background thread and publishes snapshots.
+
+    The GUI thread never collects: refresh requests are queued on the
+    worker, and a request made while a collection is running is coalesced
+    into a single follow-up collection.
+
+    The effective interval starts at the base interval and is stretched
+    whenever collection plus rendering would use more than cpu_budget of
+    one core (interval_changed reports it).
+    """
+
+    snapshot_ready = pyqtSignal(object)
+    collect_failed = pyqtSignal(str)
+    collect_requested = pyqtSignal()
+    interval_changed = pyqtSignal(int)
+
+    def __init__(self, interval=2000, cpu_budget=0.02, parent=None):
+        super().__init__(parent)
+        self.scheduler = AdaptiveInterval(base=interval, budget=cpu_budget)
+        self.interval = interval
+        self.latest = None
+        self.busy = False
+        self.pending = False
+
+        self.thread = QThread()
+        self.thread.setObjectName("elpm-snapshots")
+        self.worker = SnapshotWorker()
+        self.worker.moveToThread(self.thread)
+
+        # Cross-thread connections are queued automatically
+        self.collect_requested.connect(self.worker.collect)
+        self.worker.snapshot_ready.connect(self.on_snapshot_ready)
+        self.worker.collect_failed.connect(self.on_collect_failed)
+        self.thread.start()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.request_refresh)
+
+    def subscribe(self, slot):
+        """Connect slot to published snapshots and replay the latest one"""
+        self.snapshot_ready.connect(slot)
+        if self.latest is not None:
+            slot(self.latest)
+
+    def start(self, interval=None):
+        """Start periodic sampling (interval sets the base interval)"""
+        if interval is not None:
+            self.set_interval(self.scheduler.set_base(interval))
+        self.timer.start(self.interval)
+
+    def stop(self):
+        """Stop periodic sampling (manual refreshes still work)"""
+        self.timer.stop()
+
+    def is_active(self):
+        """Return True when periodic sampling is running"""
+        return self.timer.isActive()
+
+    def set_interval(self, interval):
+        """Apply a new effective interval"""
+        if interval == self.interval:
+            return
+        self.interval = interval
+        if self.timer.isActive():
+            self.timer.setInterval(interval)
+        self.interval_changed.emit(interval)
+
+    def set_lightweight(self, enabled):
+        """Collect only system counters (for graph history) while nothing else is shown
+
+        Leaving lightweight mode triggers one full catch-up collection.
+        """
+        if enabled == self.worker.lightweight:
+            return
+        self.worker.lightweight = enabled
+        if not enabled:
+            self.request_refresh()
+
+    def set_visible_views(self, views):
+        """Collect only what the given views show (None = everything)
+
+        Showing a view whose data the latest snapshot skipped triggers a
+        catch-up collection.
+        """
+        self.worker.visible_views = frozenset(views) if views is not None else None
+        if self.worker.wants_sockets() and self.latest is not None and not self.latest.sockets:
+            self.request_refresh()
+
+    def set_connection_states(self, states):
+        """Limit collected connections to the given states (None = all)"""
+        self.worker.connection_states = frozenset(states) if states else None
+        self.request_refresh()
+
+    def request_refresh(self):
+        """Queue a collection on the service thread without blocking"""
+        if self.busy:
+            self.pending = True
+            return
+        self.busy = True
+        self.collect_requested.emit()
+
+    def on_snapshot_ready(self, snapshot):
+        """Publish a finished snapshot on the GUI thread"""
+        self.busy = False
+        self.latest = snapshot
+
+        # Subscribers render synchronously, so this measures render cost
+        started = time.perf_counter()
+        self.snapshot_ready.emit(snapshot)
+        render_time = time.perf_counter() - started
+        self.set_interval(self.scheduler.record(snapshot.collect_time + render_time))
+
+        if self.pending:
+            self.pending = False
+            self.request_refresh()
+
+    def on_collect_failed(self, message):
+        """Free the service after a failed collection; the next tick tries again"""
+        self.busy = False
+        self.collect_failed.emit(message)
+        if self.pending:
+            self.pending = False
+            self.request_refresh()
+
+    def shutdown(self):
+        """Stop sampling and wait for the service thread to finish"""
+        self.timer.stop()
+        self.thread.quit()
+        self.thread.wait()
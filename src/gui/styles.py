@@ -185,7 +185,7 @@ QCheckBox::indicator:hover {
 }
 
 /* Table Widget */
-QTableWidget {
+QTableWidget, QTableView {
     background-color: #1a1a1a;
     alternate-background-color: #1e1e1e;
     gridline-color: #3a3a3a;
@@ -194,17 +194,17 @@ QTableWidget {
     font-size: 11px;
 }
 
-QTableWidget::item {
+QTableWidget::item, QTableView::item {
     padding: 4px 8px;
     border: none;
 }
 
-QTableWidget::item:selected {
+QTableWidget::item:selected, QTableView::item:selected {
     background-color: rgba(0, 212, 255, 0.2);
     color: #e0e0e0;
 }
 
-QTableWidget::item:hover {
+QTableWidget::item:hover, QTableView::item:hover {
     background-color: #3a3a3a;
 }
 
@@ -0,0 +1,136 @@
+"""
+Connection table model - exposes the connections of a snapshot to a QTableView.
+
+Connections are identified by their socket 5-tuple plus inode, so a
+refresh is applied as row removals for closed connections, one row
+insertion for the opened ones (appended at the bottom, so rows never jump
+around) and dataChanged for connections whose state or owner changed.
+Cells are only formatted when the view asks for them.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from gui.views.process_table_model import MAX_ROW_RANGES, runs
+
+HEADERS = ["PID", "Process", "Protocol", "Local Address", "Remote Address", "Status"]
+PID, PROCESS, PROTOCOL, LOCAL, REMOTE, STATUS = range(len(HEADERS))
+
+# Connection field -> column showing it; the other fields make up the key
+FIELD_COLUMNS = {"pid": PID, "process": PROCESS, "status": STATUS}
+
+ConnectionKey = Tuple[str, str, str, int, int]
+
+
+def connection_key(conn: Dict[str, Any]) -> ConnectionKey:
+    """Identity of a connection: the 5-tuple plus inode
+
+    The psutil fallback reports inode 0 for every socket and lists a shared
+    socket once per process, so there the owning PID tells them apart.
+    """
+    inode = conn['inode']
+    return (conn['protocol'], conn['local'], conn['remote'], inode, 0 if inode else conn['pid'])
+
+
+class ConnectionTableModel(QAbstractTableModel):
+    """Table model over the connection dicts of a snapshot"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.connections: List[Dict[str, Any]] = []
+        self.keys: List[ConnectionKey] = []  # Identity key of every table row
+
+    def set_connections(self, connections: Sequence[Dict[str, Any]]):
+        """Show the given connections, resetting the model"""
+        self.beginResetModel()
+        latest = self.unique(connections)
+        self.keys = list(latest)
+        self.connections = list(latest.values())
+        self.endResetModel()
+
+    def update(self, connections: Sequence[Dict[str, Any]]) -> bool:
+        """Move the table to new connections, signalling only what changed
+
+        Returns False when the change was too large and the model was reset
+        instead.
+        """
+        latest = self.unique(connections)
+        removed = runs([row for row, key in enumerate(self.keys) if key not in latest])
+        if len(removed) > MAX_ROW_RANGES:
+            self.set_connections(connections)
+            return False
+
+        # Closed connections go first, from the bottom up
+        for first, last in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.keys[first:last + 1]
+            del self.connections[first:last + 1]
+            self.endRemoveRows()
+
+        # The remaining rows keep their place and read the new values
+        dirty = []
+        for row, key in enumerate(self.keys):
+            old, new = self.connections[row], latest.pop(key)
+            if any(old[name] != new[name] for name in FIELD_COLUMNS):
+                dirty.append(row)
+            self.connections[row] = new
+        for first, last in runs(dirty):
+            self.dataChanged.emit(self.index(first, PID), self.index(last, STATUS))
+
+        # What is left in latest was opened since the last refresh
+        if latest:
+            first = len(self.keys)
+            self.beginInsertRows(QModelIndex(), first, first + len(latest) - 1)
+            self.keys.extend(latest)
+            self.connections.extend(latest.values())
+            self.endInsertRows()
+        return True
+
+    @staticmethod
+    def unique(connections: Sequence[Dict[str, Any]]) -> Dict[ConnectionKey, Dict[str, Any]]:
+        """Connections by key, in order; a repeated key keeps its first connection"""
+        latest = {}
+        for conn in connections:
+            latest.setdefault(connection_key(conn), conn)
+        return latest
+
+    def find(self, key: ConnectionKey) -> int:
+        """Table row showing the connection with the given key, or -1"""
+        try:
+            return self.keys.index(key)
+        except ValueError:
+            return -1
+
+    # ------------------------------------------------------------
+    # QAbstractTableModel interface
+    # ------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.connections)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self.display(self.connections[index.row()], index.column())
+
+    def display(self, conn: Dict[str, Any], column: int) -> str:
+        """Text of one cell"""
+        if column == PID:
+            return str(conn['pid'])
+        if column == PROCESS:
+            return conn['process'][:20]
+        if column == PROTOCOL:
+            return conn['protocol']
+        if column == LOCAL:
+            return conn['local']
+        if column == REMOTE:
+            return conn['remote']
+        return conn['status'] or 'N/A'
@@ -5,7 +5,6 @@ Graphs view showing CPU and Memory usage over time
 import random
 import math
 from collections import deque
-import psutil
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QHBoxLayout
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QLinearGradient, QFont
@@ -181,12 +180,17 @@ class StatsPanel(QFrame):
 class GraphsView(QWidget):
     """Graphs view showing CPU, Memory, Disk, and Network usage history"""
     
-    def __init__(self):
+    def __init__(self, snapshot_service):
         super().__init__()
         self.time_counter = 0
-        self.prev_disk_io = psutil.disk_io_counters()
-        self.prev_net_io = psutil.net_io_counters()
+        self.prev_disk_io = None
+        self.prev_net_io = None
+        self.prev_timestamp = None
+        self.snapshot_service = snapshot_service
         self.init_ui()
+
+        # Snapshots arrive from the shared background service
+        self.snapshot_service.subscribe(self.update_graphs)
     
     def init_ui(self):
         """Initialize UI components"""
@@ -238,39 +242,52 @@ class GraphsView(QWidget):
         
         layout.addWidget(stats_container)
     
-    def update_graphs(self):
-        """Update graphs with new data points from real system data"""
-        # Get real CPU and memory usage
-        cpu_value = psutil.cpu_percent(interval=0.1)
-        mem_value = psutil.virtual_memory().percent
-        
-        # Add data points
-        self.cpu_graph.add_data_point(cpu_value)
-        self.memory_graph.add_data_point(mem_value)
-        
-        # Get disk I/O
-        current_disk_io = psutil.disk_io_counters()
-        if self.prev_disk_io:
+    def update_graphs(self, snapshot):
+        """Update graphs with new data points from a system snapshot"""
+        system = snapshot.system
+        
+        # Add CPU and memory data points
+        self.cpu_graph.add_data_point(system['cpu_percent'])
+        self.memory_graph.add_data_point(system['mem_percent'])
+        
+        elapsed = snapshot.timestamp - self.prev_timestamp if self.prev_timestamp else 0
+        self.prev_timestamp = snapshot.timestamp
+        
+        # Disk I/O rate
+        current_disk_io = system['disk_io']
+        if self.prev_disk_io and current_disk_io and elapsed > 0:
             disk_read_kb = (current_disk_io.read_bytes - self.prev_disk_io.read_bytes) / 1024
             disk_write_kb = (current_disk_io.write_bytes - self.prev_disk_io.write_bytes) / 1024
-            disk_total_kb = disk_read_kb + disk_write_kb
+            disk_total_kb = (disk_read_kb + disk_write_kb) / elapsed
         else:
             disk_total_kb = 0
         self.prev_disk_io = current_disk_io
         self.disk_graph.add_data_point(disk_total_kb)
         
-        # Get network I/O
-        current_net_io = psutil.net_io_counters()
-        if self.prev_net_io:
+        # Network I/O rate
+        current_net_io = system['net_io']
+        if self.prev_net_io and current_net_io and elapsed > 0:
             net_sent_kb = (current_net_io.bytes_sent - self.prev_net_io.bytes_sent) / 1024
             net_recv_kb = (current_net_io.bytes_recv - self.prev_net_io.bytes_recv) / 1024
-            net_total_kb = net_sent_kb + net_recv_kb
+            net_total_kb = (net_sent_kb + net_recv_kb) / elapsed
         else:
             net_total_kb = 0
         self.prev_net_io = current_net_io
         self.network_graph.add_data_point(net_total_kb)
         
-        # Update statistics
+        self.time_counter += 1
+        
+        # History keeps accumulating while hidden; the stats catch up when shown
+        if self.isVisible():
+            self.update_statistics()
+    
+    def showEvent(self, event):
+        """Refresh the statistics when the tab is shown"""
+        super().showEvent(event)
+        self.update_statistics()
+    
+    def update_statistics(self):
+        """Update the avg / max / min panels from the graph history"""
         cpu_data = list(self.cpu_graph.data_points)
         mem_data = list(self.memory_graph.data_points)
         disk_data = list(self.disk_graph.data_points)
@@ -299,5 +316,3 @@ class GraphsView(QWidget):
             net_max = max(net_data)
             net_min = min(net_data)
             self.net_stats.update_stats(net_avg, net_max, net_min)
-        
-        self.time_counter += 1
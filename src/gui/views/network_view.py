@@ -1,27 +1,42 @@
-import psutil
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
+    QTableView,
     QTableWidget,
     QTableWidgetItem,
     QPushButton,
     QHeaderView,
     QTabWidget,
     QFrame,
+    QComboBox,
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
+from gui.views.connection_table_model import ConnectionTableModel
+
 
 class NetworkView(QWidget):
     """Enhanced network view showing interfaces and connections."""
 
-    def __init__(self, parent=None):
+    # Connection state filters, pushed down to the collector
+    STATE_FILTERS = {
+        "All states": None,
+        "Listening": {"LISTEN"},
+        "Established": {"ESTABLISHED"},
+    }
+
+    def __init__(self, snapshot_service, parent=None):
         super().__init__(parent)
+        self.snapshot = None
+        self.stale = False
+        self.snapshot_service = snapshot_service
         self.init_ui()
-        self.start_auto_refresh()
+
+        # Snapshots arrive from the shared background service
+        self.snapshot_service.subscribe(self.apply_snapshot)
 
     # ------------------------------------------------------------
     # UI SETUP
@@ -41,7 +56,7 @@ class NetworkView(QWidget):
         refresh_btn = QPushButton("↻ Refresh")
         refresh_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         refresh_btn.setFixedWidth(100)
-        refresh_btn.clicked.connect(self.update_network_data)
+        refresh_btn.clicked.connect(self.snapshot_service.request_refresh)
         refresh_btn.setStyleSheet(
             """
             QPushButton {
@@ -98,7 +113,6 @@ class NetworkView(QWidget):
         self.tab_widget.addTab(self.connections_tab, "Connections")
 
         self.setLayout(layout)
-        self.update_network_data()
 
     def create_interfaces_tab(self):
         """Create the interfaces statistics tab."""
@@ -116,9 +130,10 @@ class NetworkView(QWidget):
         self.interfaces_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.interfaces_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.interfaces_table.verticalHeader().setVisible(False)
+        # QTableView also styles the model-backed connections table
         self.interfaces_table.setStyleSheet(
             """
-            QTableWidget {
+            QTableView {
                 background-color: #121212;
                 color: #E0E0E0;
                 gridline-color: #2A2A2A;
@@ -147,18 +162,26 @@ class NetworkView(QWidget):
         # Filter controls
         filter_layout = QHBoxLayout()
         filter_layout.addWidget(QLabel("Filter:"))
+        self.state_combo = QComboBox()
+        self.state_combo.addItems(list(self.STATE_FILTERS))
+        self.state_combo.currentTextChanged.connect(self.on_state_filter_changed)
+        filter_layout.addWidget(self.state_combo)
         filter_layout.addStretch()
 
-        self.conn_table = QTableWidget(0, 6)
-        self.conn_table.setHorizontalHeaderLabels(
-            ["PID", "Process", "Protocol", "Local Address", "Remote Address", "Status"]
-        )
+        # Model-backed: refreshes are applied as row inserts, removals and
+        # cell updates instead of rebuilding every item
+        self.conn_model = ConnectionTableModel(self)
+        self.conn_table = QTableView()
+        self.conn_table.setModel(self.conn_model)
         self.conn_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.ResizeMode.Stretch
         )
         self.conn_table.setAlternatingRowColors(True)
-        self.conn_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.conn_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.conn_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.conn_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        # Fixed row heights; sizing rows to their contents measures every row
+        self.conn_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.conn_table.verticalHeader().setDefaultSectionSize(24)
         self.conn_table.verticalHeader().setVisible(False)
         self.conn_table.setStyleSheet(self.interfaces_table.styleSheet())
 
@@ -169,14 +192,39 @@ class NetworkView(QWidget):
     # ------------------------------------------------------------
     # DATA HANDLING
     # ------------------------------------------------------------
+    def apply_snapshot(self, snapshot):
+        """Display network data from a snapshot published by the service."""
+        self.snapshot = snapshot
+        # Hidden tabs only keep the snapshot and catch up when shown
+        if not self.isVisible():
+            self.stale = True
+            return
+        self.update_network_data()
+
+    def showEvent(self, event):
+        """Render the latest snapshot if it arrived while hidden."""
+        super().showEvent(event)
+        if self.stale:
+            self.update_network_data()
+
     def update_network_data(self):
-        """Fetch and display network statistics."""
+        """Display network statistics from the current snapshot."""
+        self.stale = False
+        if self.snapshot is None:
+            return
         self.update_interfaces()
-        self.update_connections()
+        # Snapshots taken while this tab was hidden carry no connections;
+        # keep the rows until the catch-up collection arrives
+        if self.snapshot.sockets:
+            self.update_connections()
+
+    def on_state_filter_changed(self, text):
+        """Apply a connection state filter."""
+        self.snapshot_service.set_connection_states(self.STATE_FILTERS[text])
 
     def update_interfaces(self):
         """Update interface statistics."""
-        stats = psutil.net_io_counters(pernic=True)
+        stats = self.snapshot.interfaces
         self.interfaces_table.setRowCount(0)
 
         for iface, info in stats.items():
@@ -196,48 +244,16 @@ class NetworkView(QWidget):
 
     def update_connections(self):
         """Update network connections."""
-        try:
-            connections = psutil.net_connections(kind='inet')
-            self.conn_table.setRowCount(0)
-
-            for conn in connections:
-                try:
-                    # Get process name if PID exists
-                    proc_name = "N/A"
-                    if conn.pid:
-                        try:
-                            proc = psutil.Process(conn.pid)
-                            proc_name = proc.name()[:20]  # Limit length
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            pass
-
-                    # Format addresses
-                    local_addr = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else "N/A"
-                    remote_addr = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "N/A"
-
-                    row = self.conn_table.rowCount()
-                    self.conn_table.insertRow(row)
-
-                    self.conn_table.setItem(row, 0, QTableWidgetItem(str(conn.pid or 0)))
-                    self.conn_table.setItem(row, 1, QTableWidgetItem(proc_name))
-                    self.conn_table.setItem(row, 2, QTableWidgetItem('TCP' if conn.type == 1 else 'UDP'))
-                    self.conn_table.setItem(row, 3, QTableWidgetItem(local_addr))
-                    self.conn_table.setItem(row, 4, QTableWidgetItem(remote_addr))
-                    self.conn_table.setItem(row, 5, QTableWidgetItem(conn.status or 'N/A'))
-
-                except Exception:
-                    continue
-
-            self.conn_table.resizeRowsToContents()
-        except (psutil.AccessDenied, Exception):
-            # Clear table if access denied
-            self.conn_table.setRowCount(0)
-
-    def start_auto_refresh(self, interval=5000):
-        """Start automatic refresh every few seconds."""
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_network_data)
-        self.timer.start(interval)
+        scroll_bar = self.conn_table.verticalScrollBar()
+        scroll = scroll_bar.value()
+        selected = self.conn_table.selectionModel().selectedRows()
+        key = self.conn_model.keys[selected[0].row()] if selected else None
+        if not self.conn_model.update(self.snapshot.connections):
+            # The model was reset; put the selection and scroll position back
+            scroll_bar.setValue(scroll)
+            row = self.conn_model.find(key) if key is not None else -1
+            if row >= 0:
+                self.conn_table.selectRow(row)
 
     # ------------------------------------------------------------
     # UTILITIES
@@ -0,0 +1,306 @@
+"""
+Process table model - exposes the rows of a columnar snapshot to a QTableView.
+
+Nothing is materialized up front: data() formats a cell only when the view
+asks for it, which is only for the rows on screen. Fonts, brushes and
+alignments are created once and handed out from caches.
+
+Rows are identified by their (pid, create_time) key, so a refresh is
+applied as row removals, a reorder, row insertions and dataChanged for the
+changed cells; selections and the scroll position survive refreshes.
+"""
+
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor, QFont
+
+from models.columnar import ProcessColumns, ProcessRow
+from models.diff import ProcessKey
+from models.process_model import format_bytes
+
+HEADERS = ["PID", "User", "CPU%", "MEM%", "VSZ", "RSS", "Status", "Threads", "Priority", "Command"]
+PID, USER, CPU, MEM, VSZ, RSS, STATUS, THREADS, PRIORITY, COMMAND = range(len(HEADERS))
+
+# Column widths; the command column stretches
+COLUMN_WIDTHS = {PID: 70, USER: 100, CPU: 80, MEM: 80, VSZ: 90, RSS: 90, STATUS: 90, THREADS: 70, PRIORITY: 70}
+
+RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+CENTER = Qt.AlignmentFlag.AlignCenter
+ALIGNMENTS = {PID: RIGHT, CPU: RIGHT, MEM: RIGHT, VSZ: RIGHT, RSS: RIGHT,
+              STATUS: CENTER, THREADS: CENTER, PRIORITY: CENTER}
+MONO_COLUMNS = frozenset((PID, CPU, MEM, VSZ, RSS, THREADS, PRIORITY))
+
+# Snapshot field -> column showing it; other fields need no repaint
+FIELD_COLUMNS = {
+    "pid": PID, "user": USER, "cpu": CPU, "mem": MEM, "vsz": VSZ, "rss": RSS,
+    "status": STATUS, "threads": THREADS, "priority": PRIORITY, "command": COMMAND,
+}
+COLUMN_FIELDS = {column: name for name, column in FIELD_COLUMNS.items()}
+
+# Columns that sort largest first on the first click
+DESCENDING_COLUMNS = frozenset((CPU, MEM, VSZ, RSS, THREADS))
+
+# Above this many inserted/removed row ranges one reset is cheaper than
+# signalling every range (e.g. when the search text changes)
+MAX_ROW_RANGES = 256
+
+ROW_KEYS = "row_keys"
+
+STATUS_COLORS = {
+    "running": "#51cf66",
+    "sleeping": "#4ecdc4",
+    "zombie": "#ff6b6b",
+    "stopped": "#ffd93d",
+    "dead": "#ff6b6b",
+    "disk-sleep": "#4ecdc4",
+    "idle": "#a0a0a0",
+}
+
+
+def cpu_color(cpu: float) -> str:
+    """Color for a CPU usage value"""
+    if cpu > 70:
+        return "#ff6b6b"
+    elif cpu > 40:
+        return "#ffd93d"
+    return "#51cf66"
+
+
+def priority_color(priority: int) -> str:
+    """Color for a scheduling priority"""
+    if priority < 0:
+        return "#51cf66"
+    return "#a0a0a0" if priority == 0 else "#ff6b6b"
+
+
+def row_keys(columns: ProcessColumns, rows: np.ndarray) -> List[ProcessKey]:
+    """Identity keys of the given row positions"""
+    keys = columns.derive(ROW_KEYS, columns.keys)
+    return [keys[position] for position in rows.tolist()]
+
+
+def runs(values: List[int]) -> List[Tuple[int, int]]:
+    """Group sorted integers into (first, last) ranges of consecutive values"""
+    ranges = []
+    for value in values:
+        if ranges and ranges[-1][1] == value - 1:
+            ranges[-1] = (ranges[-1][0], value)
+        else:
+            ranges.append((value, value))
+    return ranges
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """Table model over (columnar snapshot, ordered row positions)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns: Optional[ProcessColumns] = None
+        self.rows = np.empty(0, dtype=np.intp)
+        self.keys: List[ProcessKey] = []  # Identity key of every table row
+        self.sort_marks: Dict[int, str] = {}  # Column -> sort arrow shown in its header
+        self.mono_font = QFont("Consolas", 9)
+        self.brushes = {}
+        self.high_usage_brush = QBrush(QColor("#ff6b6b").darker(300))
+
+    def brush(self, color: str) -> QBrush:
+        """Cached brush for a color"""
+        brush = self.brushes.get(color)
+        if brush is None:
+            brush = self.brushes[color] = QBrush(QColor(color))
+        return brush
+
+    def set_rows(self, columns: ProcessColumns, rows: np.ndarray):
+        """Show the given row positions of a snapshot, in order, resetting the model"""
+        self.beginResetModel()
+        self.columns = columns
+        self.rows = rows
+        self.keys = row_keys(columns, rows)
+        self.endResetModel()
+
+    def update(self, columns: ProcessColumns, rows: np.ndarray,
+               changed: Optional[Dict[ProcessKey, FrozenSet[str]]] = None) -> bool:
+        """Move the table to new snapshot rows, signalling only what changed
+
+        changed maps identity keys to the fields that changed since the
+        shown snapshot; None repaints every row. Returns False when the
+        change was too large and the model was reset instead.
+        """
+        if self.columns is None:
+            self.set_rows(columns, rows)
+            return False
+
+        new_keys = row_keys(columns, rows)
+        new_rows = {key: row for row, key in enumerate(new_keys)}
+        old_keys = set(self.keys)
+        removed = runs([row for row, key in enumerate(self.keys) if key not in new_rows])
+        inserted_rows = [row for row, key in enumerate(new_keys) if key not in old_keys]
+        inserted = runs(inserted_rows)
+        if len(removed) + len(inserted) > MAX_ROW_RANGES:
+            self.set_rows(columns, rows)
+            return False
+
+        # Exited (or filtered out) rows go first, from the bottom up
+        for first, last in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.keys[first:last + 1]
+            self.rows = np.delete(self.rows, np.s_[first:last + 1])
+            self.endRemoveRows()
+
+        # The remaining rows now read from the new snapshot, in the new order
+        survivors = np.delete(np.arange(len(new_keys)), inserted_rows).tolist()
+        surviving_keys = [new_keys[row] for row in survivors]
+        if surviving_keys != self.keys:
+            self.layoutAboutToBeChanged.emit()
+            target = {key: row for row, key in enumerate(surviving_keys)}
+            persistent = self.persistentIndexList()
+            self.changePersistentIndexList(persistent, [
+                self.index(target[self.keys[index.row()]], index.column())
+                for index in persistent
+            ])
+            self.columns, self.rows, self.keys = columns, rows[survivors], surviving_keys
+            self.layoutChanged.emit()
+        else:
+            self.columns, self.rows = columns, rows[survivors]
+
+        # New rows are inserted top down, so earlier rows are already in place
+        for first, last in inserted:
+            self.beginInsertRows(QModelIndex(), first, last)
+            self.keys[first:first] = new_keys[first:last + 1]
+            self.rows = np.insert(self.rows, first, rows[first:last + 1])
+            self.endInsertRows()
+
+        self.emit_changed(changed, new_rows, old_keys)
+        return True
+
+    def emit_changed(self, changed, new_rows, old_keys):
+        """Emit dataChanged for the cells of changed rows, one signal per row range"""
+        if not self.keys:
+            return
+        if changed is None:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.keys) - 1, len(HEADERS) - 1))
+            return
+
+        dirty = {}
+        for key, fields in changed.items():
+            row = new_rows.get(key)
+            if row is None or key not in old_keys:
+                continue
+            columns = [FIELD_COLUMNS[name] for name in fields if name in FIELD_COLUMNS]
+            if columns:
+                dirty[row] = columns
+        for first, last in runs(sorted(dirty)):
+            columns = [column for row in range(first, last + 1) for column in dirty[row]]
+            self.dataChanged.emit(self.index(first, min(columns)), self.index(last, max(columns)))
+
+    def set_sort(self, sort: List[Tuple[int, bool]]):
+        """Show sort arrows for (column, descending) keys, numbered when there are several"""
+        marks = {}
+        for number, (column, descending) in enumerate(sort, 1):
+            arrow = "▼" if descending else "▲"
+            marks[column] = f"{arrow}{number}" if len(sort) > 1 else arrow
+        self.sort_marks = marks
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(HEADERS) - 1)
+
+    def find(self, key: ProcessKey) -> int:
+        """Table row showing the process with the given key, or -1"""
+        try:
+            return self.keys.index(key)
+        except ValueError:
+            return -1
+
+    def position(self, row: int) -> int:
+        """Snapshot row position shown at a table row"""
+        return int(self.rows[row])
+
+    def process(self, row: int) -> Optional[ProcessRow]:
+        """Process shown at a table row"""
+        if self.columns is None or not 0 <= row < len(self.rows):
+            return None
+        return self.columns[self.position(row)]
+
+    def iter_processes(self) -> Iterator[ProcessRow]:
+        """All shown processes, in table order"""
+        for position in self.rows.tolist():
+            yield self.columns[position]
+
+    # ------------------------------------------------------------
+    # QAbstractTableModel interface
+    # ------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            mark = self.sort_marks.get(section)
+            return f"{HEADERS[section]} {mark}" if mark else HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return ALIGNMENTS.get(column)
+        if role == Qt.ItemDataRole.FontRole:
+            return self.mono_font if column in MONO_COLUMNS else None
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ForegroundRole,
+                        Qt.ItemDataRole.BackgroundRole):
+            return None
+
+        process = self.columns[self.position(index.row())]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display(process, column)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.foreground(process, column)
+        return self.background(process, column)
+
+    def display(self, process: ProcessRow, column: int) -> str:
+        """Text of one cell"""
+        if column == PID:
+            return str(process.pid)
+        if column == USER:
+            return process.user[:15]
+        if column == CPU:
+            return f"{process.cpu:.1f}"
+        if column == MEM:
+            return f"{process.mem:.1f}"
+        if column == VSZ:
+            return format_bytes(process.vsz)
+        if column == RSS:
+            return format_bytes(process.rss)
+        if column == STATUS:
+            return process.status
+        if column == THREADS:
+            return str(process.threads)
+        if column == PRIORITY:
+            return str(process.priority)
+        return process.command[:80]
+
+    def foreground(self, process: ProcessRow, column: int) -> Optional[QBrush]:
+        """Text color of one cell"""
+        if column == USER:
+            return self.brush("#ff6347") if process.user == "root" else None
+        if column == CPU:
+            return self.brush(cpu_color(process.cpu))
+        if column in (VSZ, RSS):
+            return self.brush("#a0a0a0")
+        if column == STATUS:
+            return self.brush(STATUS_COLORS.get(process.status, "#e0e0e0"))
+        if column == PRIORITY:
+            return self.brush(priority_color(process.priority))
+        return None
+
+    def background(self, process: ProcessRow, column: int) -> Optional[QBrush]:
+        """Background of one cell: highlights heavy CPU and memory users"""
+        if column == CPU and process.cpu > 70:
+            return self.high_usage_brush
+        if column == MEM and process.mem > 10:
+            return self.high_usage_brush
+        return None
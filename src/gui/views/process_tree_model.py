@@ -0,0 +1,695 @@
+"""
+Process tree model - exposes a columnar snapshot as a parent/child tree.
+
+Nodes are identified by their (pid, create_time) key and survive refreshes:
+an update inserts new processes, moves re-parented ones, removes exited ones
+and emits dataChanged for the rest, so the view keeps its expanded and
+selected nodes. Cells are formatted only when the view asks for them.
+
+Every node also carries the CPU, RSS and thread totals and the descendant
+count of its subtree. They are summed bottom-up after structural changes;
+when only a few values changed, the deltas are added along the ancestor
+paths instead.
+
+While searching, the view passes the matches together with their
+ancestors, and the matches are highlighted.
+
+With grouping on, siblings sharing an executable name are collapsed into
+one group node ("php-fpm ×312"). Its members are only listed to the view
+(fetchMore) once the group is expanded; until then they are updated
+without any signals.
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+import numpy as np
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor, QFont
+
+from gui.views.process_table_model import STATUS_COLORS, row_keys
+from models.columnar import ProcessColumns, ProcessRow
+from models.diff import ProcessKey
+from models.process_model import format_bytes, parent_indexes
+from models.query import lower_strings
+
+HEADERS = [
+    "PID", "Process Name", "CPU%", "MEM%", "Status", "User",
+    "Tree CPU%", "Tree RSS", "Tree Threads", "Descendants",
+]
+PID, NAME, CPU, MEM, STATUS, USER, TREE_CPU, TREE_RSS, TREE_THREADS, DESCENDANTS = range(len(HEADERS))
+COLUMN_WIDTHS = {
+    PID: 80, NAME: 350, CPU: 80, MEM: 80, STATUS: 100, USER: 120,
+    TREE_CPU: 90, TREE_RSS: 90, TREE_THREADS: 100, DESCENDANTS: 90,
+}
+
+RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+MONO_COLUMNS = frozenset((PID, CPU, MEM, TREE_CPU, TREE_RSS, TREE_THREADS, DESCENDANTS))
+
+# Snapshot field shown in each process column
+COLUMN_FIELDS = {PID: "pid", NAME: "name", CPU: "cpu", MEM: "mem", STATUS: "status", USER: "user"}
+# Node attribute shown in each subtree column
+TOTAL_ATTRS = {
+    TREE_CPU: "cpu_total", TREE_RSS: "rss_total",
+    TREE_THREADS: "threads_total", DESCENDANTS: "descendants",
+}
+
+# Snapshot fields shown in the tree; changes to other fields need no repaint
+SHOWN_FIELDS = frozenset(("pid", "name", "cpu", "mem", "status", "user", "rss", "threads"))
+# Snapshot fields summed over subtrees
+TOTAL_FIELDS = frozenset(("cpu", "rss", "threads"))
+
+# Above this many inserted, moved or removed nodes one reset is cheaper than
+# signalling every node (e.g. when the search text changes)
+MAX_NODE_CHANGES = 512
+
+# Siblings with the same name are grouped from this many on
+GROUP_MIN_SIBLINGS = 8
+
+
+def cpu_color(cpu: float) -> str:
+    """Color for a CPU usage value (the tree uses lower thresholds than the table)"""
+    if cpu > 50:
+        return "#ff6b6b"
+    elif cpu > 20:
+        return "#ffd93d"
+    return "#51cf66"
+
+
+def group_key(parent_key: Optional[ProcessKey], name: str) -> tuple:
+    """Identity key of the group of name siblings under parent_key"""
+    return ("group", parent_key, name)
+
+
+def is_group_key(key) -> bool:
+    """True for keys made by group_key()"""
+    return key[0] == "group"
+
+
+def group_siblings(parents: Dict, names: Dict[ProcessKey, str]) -> Dict:
+    """Reparent same-named siblings under group keys, for groups of GROUP_MIN_SIBLINGS or more"""
+    siblings: Dict[tuple, List[ProcessKey]] = {}
+    for key, parent_key in parents.items():
+        siblings.setdefault((parent_key, names[key]), []).append(key)
+    grouped = dict(parents)
+    for (parent_key, name), members in siblings.items():
+        if len(members) >= GROUP_MIN_SIBLINGS:
+            group = group_key(parent_key, name)
+            grouped[group] = parent_key
+            for key in members:
+                grouped[key] = group
+    return grouped
+
+
+class TreeNode:
+    """One process in the tree, a group of same-named siblings, or the invisible root"""
+
+    __slots__ = (
+        "key", "position", "parent", "children", "row", "group", "fetched",
+        "cpu_total", "rss_total", "threads_total", "descendants",
+    )
+
+    def __init__(self, key, position: Optional[int] = None, group: Optional[str] = None):
+        self.key = key
+        self.position = position  # Row in the model's snapshot, None while leaving
+        self.group = group  # Shared name of a group node's members
+        self.fetched = False  # Whether a group's members are listed to the view
+        self.parent: Optional["TreeNode"] = None
+        self.children: List["TreeNode"] = []
+        self.row = 0  # Index in parent.children
+        # Totals of this node and all its descendants
+        self.cpu_total = 0.0
+        self.rss_total = 0
+        self.threads_total = 0
+        self.descendants = 0
+
+    def shows_children(self) -> bool:
+        """False for a group whose members were not fetched yet"""
+        return self.group is None or self.fetched
+
+    def attach(self, child: "TreeNode", row: int):
+        """Insert child at row, renumbering the siblings after it"""
+        child.parent = self
+        self.children.insert(row, child)
+        self.renumber(row)
+
+    def detach(self, child: "TreeNode"):
+        """Remove child, renumbering the siblings after it"""
+        del self.children[child.row]
+        self.renumber(child.row)
+        child.parent = None
+
+    def renumber(self, start: int):
+        """Refresh the row of the children from start on"""
+        children = self.children
+        for row in range(start, len(children)):
+            children[row].row = row
+
+    def walk(self) -> Iterable["TreeNode"]:
+        """This node's descendants, parents before children"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+
+def tree_parents(columns: ProcessColumns, rows: np.ndarray, shown: List[ProcessKey],
+                 namespaces: Optional[Dict[int, int]] = None) -> Dict[ProcessKey, Optional[ProcessKey]]:
+    """Parent key of every given row (shown holds their keys), None for roots
+
+    Uses the same rules as build_process_tree (parent_indexes): a process
+    whose parent is not among the rows or in another PID namespace becomes
+    a root, and parent loops are cut at their lowest PID.
+    """
+    pids = columns.column("pid")[rows].tolist()
+    ppids = columns.column("ppid")[rows].tolist()
+    parents = parent_indexes(pids, ppids, namespaces)
+    return {key: None if parent < 0 else shown[parent] for key, parent in zip(shown, parents)}
+
+
+class ProcessTreeModel(QAbstractItemModel):
+    """Tree model over (columnar snapshot, row positions to show)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns: Optional[ProcessColumns] = None
+        self.root = TreeNode(None)
+        self.nodes: Dict[ProcessKey, TreeNode] = {}
+        self.sort_column = PID
+        self.sort_descending = False
+        self.grouping = False
+        self.matches: Optional[np.ndarray] = None  # Search hits by snapshot row, None when not searching
+        self.namespaces: Optional[Dict[int, int]] = None  # PID -> PID namespace of the snapshot
+        self.mono_font = QFont("Consolas", 9)
+        self.brushes = {}
+        self.match_brush = QBrush(QColor("#00d4ff").darker(350))
+
+    def brush(self, color: str) -> QBrush:
+        """Cached brush for a color"""
+        brush = self.brushes.get(color)
+        if brush is None:
+            brush = self.brushes[color] = QBrush(QColor(color))
+        return brush
+
+    def set_rows(self, columns: ProcessColumns, rows: np.ndarray):
+        """Build the tree of the given snapshot rows from scratch, resetting the model"""
+        self.beginResetModel()
+        self.columns = columns
+        self.root = TreeNode(None)
+        self.nodes = {}
+        positions, parents = self.target(columns, rows)
+        for key in parents:
+            self.nodes[key] = self.new_node(key, positions)
+        for key, parent_key in parents.items():
+            node = self.nodes[key]
+            parent = self.root if parent_key is None else self.nodes[parent_key]
+            node.parent = parent
+            parent.children.append(node)
+        self.aggregate()
+        sort_key = self.sort_key()
+        for node in [self.root, *self.nodes.values()]:
+            node.children.sort(key=sort_key, reverse=self.sort_descending)
+            node.renumber(0)
+        self.endResetModel()
+
+    def update(self, columns: ProcessColumns, rows: np.ndarray,
+               changed: Optional[Dict[ProcessKey, FrozenSet[str]]] = None) -> bool:
+        """Move the tree to new snapshot rows, signalling only what changed
+
+        changed maps identity keys to the fields that changed since the
+        shown snapshot; None repaints every node. Returns False when the
+        change was too large and the model was reset instead.
+        """
+        if self.columns is None:
+            self.set_rows(columns, rows)
+            return False
+
+        positions, parents = self.target(columns, rows)
+        nodes = self.nodes
+        added = [key for key in parents if key not in nodes]
+        removed = [key for key in nodes if key not in parents]
+        moved = [
+            key for key, parent_key in parents.items()
+            if key in nodes and nodes[key].parent.key != parent_key
+        ]
+        if len(added) + len(removed) + len(moved) > MAX_NODE_CHANGES:
+            self.set_rows(columns, rows)
+            return False
+
+        # With only a few values changed, the totals are patched along the
+        # ancestor paths; these deltas need the old positions
+        deltas = None
+        if changed is not None and not (added or removed or moved) and len(changed) <= len(nodes) // 4:
+            deltas = self.total_deltas(columns, changed, positions)
+
+        # Every remaining node reads from the new snapshot from here on
+        self.columns = columns
+        for key, node in nodes.items():
+            node.position = positions.get(key)
+
+        # New and re-parented nodes are placed parents first, so a
+        # destination always exists and is never inside the node it receives
+        placed = set(added) | set(moved)
+        receivers = set()
+        sources = set()
+        for key in sorted(placed, key=lambda key: self.depth(key, parents)):
+            parent_key = parents[key]
+            parent = self.root if parent_key is None else nodes[parent_key]
+            node = nodes.get(key)
+            if node is None:
+                nodes[key] = node = self.new_node(key, positions)
+                self.insert_node(node, parent)
+            else:
+                sources.add(node.parent)
+                self.move_node(node, parent)
+            receivers.add(parent)
+
+        # Exited nodes only have exited descendants left; drop whole subtrees
+        for key in removed:
+            node = nodes.get(key)
+            # Nodes under another exited node leave together with it
+            if node is None or (node.parent is not self.root and node.parent.key not in parents):
+                continue
+            parent = node.parent
+            sources.add(parent)
+            listed = self.listed(parent)
+            if listed:
+                self.beginRemoveRows(self.node_index(parent), node.row, node.row)
+            parent.detach(node)
+            for descendant in node.walk():
+                del nodes[descendant.key]
+            del nodes[key]
+            if listed:
+                self.endRemoveRows()
+
+        if deltas is None:
+            self.aggregate()
+            dirty = set(nodes.values())
+        else:
+            dirty = {
+                nodes[key] for key, fields in changed.items()
+                if key in nodes and not fields.isdisjoint(SHOWN_FIELDS)
+            }
+            # Groups show the summed values of their members
+            dirty |= {node.parent for node in dirty if node.parent.group is not None}
+            for node, cpu, rss, threads in deltas:
+                self.roll_up(node, cpu, rss, threads, dirty)
+
+        # Siblings are re-sorted where their sort values or members changed;
+        # a group's PID is that of its first member
+        if self.sort_column == PID:
+            regrouped = {
+                node.parent for node in receivers | sources
+                if node.group is not None and nodes.get(node.key) is node
+            }
+            self.resort(receivers | regrouped)
+        else:
+            self.resort(receivers | {node.parent for node in dirty})
+        self.emit_changed(dirty)
+        return True
+
+    def target(self, columns: ProcessColumns, rows: np.ndarray):
+        """(key -> snapshot position, key -> parent key) of the tree to show"""
+        shown = row_keys(columns, rows)
+        parents = tree_parents(columns, rows, shown, self.namespaces)
+        if self.grouping:
+            strings = columns.strings
+            names = [strings[code] for code in columns.column("name")[rows].tolist()]
+            parents = group_siblings(parents, dict(zip(shown, names)))
+        return dict(zip(shown, rows.tolist())), parents
+
+    def new_node(self, key, positions: Dict[ProcessKey, int]) -> TreeNode:
+        """Node for a process or group key"""
+        if is_group_key(key):
+            return TreeNode(key, group=key[2])
+        return TreeNode(key, positions[key])
+
+    def listed(self, node: TreeNode) -> bool:
+        """True if the view knows node's children (no unfetched group on the way up)"""
+        while node is not self.root:
+            if not node.shows_children():
+                return False
+            node = node.parent
+        return True
+
+    def insert_node(self, node: TreeNode, parent: TreeNode):
+        """Append a new node to parent, signalling it if the view lists parent's children"""
+        row = len(parent.children)
+        if self.listed(parent):
+            self.beginInsertRows(self.node_index(parent), row, row)
+            parent.attach(node, row)
+            self.endInsertRows()
+        else:
+            parent.attach(node, row)
+
+    def move_node(self, node: TreeNode, parent: TreeNode):
+        """Move node to the end of parent's children
+
+        A move into or out of an unfetched group is signalled as a plain
+        insertion or removal on the side the view can see.
+        """
+        source = node.parent
+        row = len(parent.children)
+        from_listed, to_listed = self.listed(source), self.listed(parent)
+        if from_listed and to_listed:
+            self.beginMoveRows(self.node_index(source), node.row, node.row, self.node_index(parent), row)
+            source.detach(node)
+            parent.attach(node, row)
+            self.endMoveRows()
+            return
+        if from_listed:
+            self.beginRemoveRows(self.node_index(source), node.row, node.row)
+        source.detach(node)
+        if from_listed:
+            self.endRemoveRows()
+        if to_listed:
+            self.beginInsertRows(self.node_index(parent), row, row)
+        parent.attach(node, row)
+        if to_listed:
+            self.endInsertRows()
+
+    def set_namespaces(self, namespaces: Optional[Dict[int, int]]):
+        """PID namespaces of the next snapshot; processes in a new namespace become roots"""
+        self.namespaces = namespaces
+
+    def set_matches(self, matches: Optional[np.ndarray]):
+        """Highlight the snapshot rows marked in matches (applied on the next update)"""
+        self.matches = matches
+
+    def set_grouping(self, enabled: bool):
+        """Turn collapsing of same-named siblings on or off (applied on the next update)"""
+        self.grouping = enabled
+
+    def total_deltas(self, columns: ProcessColumns, changed: Dict[ProcessKey, FrozenSet[str]],
+                     positions: Dict[ProcessKey, int]) -> List[tuple]:
+        """(node, cpu, rss, threads) change of every node whose summed fields changed"""
+        old, new = self.columns.arrays, columns.arrays
+        deltas = []
+        for key, fields in changed.items():
+            node = self.nodes.get(key)
+            if node is None or fields.isdisjoint(TOTAL_FIELDS):
+                continue
+            before, after = node.position, positions[key]
+            deltas.append((
+                node,
+                new["cpu"].item(after) - old["cpu"].item(before),
+                new["rss"].item(after) - old["rss"].item(before),
+                new["threads"].item(after) - old["threads"].item(before),
+            ))
+        return deltas
+
+    def roll_up(self, node: TreeNode, cpu: float, rss: int, threads: int, dirty: Set[TreeNode]):
+        """Add a change of node's own values to the totals of node and its ancestors"""
+        while node is not self.root:
+            node.cpu_total += cpu
+            node.rss_total += rss
+            node.threads_total += threads
+            dirty.add(node)
+            node = node.parent
+
+    def aggregate(self):
+        """Recompute every subtree total bottom-up: O(nodes)"""
+        arrays = self.columns.arrays
+        cpu, rss, threads = arrays["cpu"].tolist(), arrays["rss"].tolist(), arrays["threads"].tolist()
+        order = list(self.root.walk())
+        for node in order:
+            position = node.position
+            if position is None:  # Groups only sum their members
+                node.cpu_total, node.rss_total, node.threads_total = 0.0, 0, 0
+            else:
+                node.cpu_total = cpu[position]
+                node.rss_total = rss[position]
+                node.threads_total = threads[position]
+            node.descendants = 0
+        # Parents come before their children in order, so reversed it is bottom-up
+        root = self.root
+        for node in reversed(order):
+            parent = node.parent
+            if parent is not root:
+                parent.cpu_total += node.cpu_total
+                parent.rss_total += node.rss_total
+                parent.threads_total += node.threads_total
+                parent.descendants += node.descendants + (node.group is None)
+
+    def sort_key(self) -> Callable[[TreeNode], Any]:
+        """Key ordering siblings by the sort column (ties by identity key)
+
+        Groups sort by their lowest member PID, their name, or the sum of
+        their members' CPU or memory.
+        """
+        column = self.sort_column
+        if column in TOTAL_ATTRS:
+            attr = TOTAL_ATTRS[column]
+            value = lambda node: getattr(node, attr)  # noqa: E731
+        elif column == PID:
+            def value(node):
+                if node.group is None:
+                    return node.key[0]
+                return min((child.key[0] for child in node.children), default=0)
+        elif column in (NAME, STATUS, USER):
+            values = self.columns.column(COLUMN_FIELDS[column]).tolist()
+            lowered = lower_strings(self.columns)
+
+            def value(node):
+                if node.group is None:
+                    return lowered[values[node.position]]
+                return node.group.lower() if column == NAME else ""
+        else:
+            values = self.columns.column(COLUMN_FIELDS[column]).tolist()
+
+            def value(node):
+                if node.group is None:
+                    return values[node.position]
+                return sum(values[child.position] for child in node.children)
+
+        # Processes and groups never tie with each other
+        return lambda node: (value(node), (0, node.key) if node.group is None else (1, node.group))
+
+    def resort(self, parents: Iterable[TreeNode]):
+        """Re-sort the children of parents, moving persistent indexes along"""
+        sort_key = self.sort_key()
+        reordered = []
+        for parent in parents:
+            children = parent.children
+            if len(children) < 2:
+                continue
+            ordered = sorted(children, key=sort_key, reverse=self.sort_descending)
+            if ordered != children:
+                reordered.append((parent, ordered))
+        if not reordered:
+            return
+        # Order changes the view cannot see need no layout change
+        if not any(self.listed(parent) for parent, _ordered in reordered):
+            for parent, ordered in reordered:
+                parent.children = ordered
+                parent.renumber(0)
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        targets = [index.internalPointer() for index in persistent]
+        for parent, ordered in reordered:
+            parent.children = ordered
+            parent.renumber(0)
+        self.changePersistentIndexList(persistent, [
+            self.createIndex(node.row, index.column(), node)
+            for node, index in zip(targets, persistent)
+        ])
+        self.layoutChanged.emit()
+
+    def depth(self, key: ProcessKey, parents: Dict[ProcessKey, Optional[ProcessKey]]) -> int:
+        """Depth of key in the target tree (0 for roots)"""
+        depth = 0
+        key = parents[key]
+        while key is not None:
+            depth += 1
+            key = parents[key]
+        return depth
+
+    def emit_changed(self, dirty: Iterable[TreeNode]):
+        """Emit dataChanged for the given nodes the view knows, one signal per parent"""
+        ranges = {}
+        listed = {}
+        for node in dirty:
+            parent = node.parent
+            if parent not in listed:
+                listed[parent] = self.listed(parent)
+            if not listed[parent]:
+                continue
+            first, last = ranges.get(id(node.parent), (node, node))
+            ranges[id(node.parent)] = (
+                node if node.row < first.row else first,
+                node if node.row > last.row else last,
+            )
+        for first, last in ranges.values():
+            self.dataChanged.emit(
+                self.createIndex(first.row, 0, first), self.createIndex(last.row, len(HEADERS) - 1, last)
+            )
+
+    def node_index(self, node: TreeNode, column: int = 0) -> QModelIndex:
+        """Model index of a node (invalid for the root)"""
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, column, node)
+
+    def key_index(self, key) -> QModelIndex:
+        """Model index of the node with the given key (invalid if not listed to the view)"""
+        node = self.nodes.get(key)
+        if node is None or not self.listed(node.parent):
+            return QModelIndex()
+        return self.node_index(node)
+
+    def key(self, index: QModelIndex) -> Optional[ProcessKey]:
+        """Identity key of the process at index"""
+        return index.internalPointer().key if index.isValid() else None
+
+    def process(self, index: QModelIndex) -> Optional[ProcessRow]:
+        """Process at index"""
+        if not index.isValid():
+            return None
+        position = index.internalPointer().position
+        return None if position is None else self.columns[position]
+
+    # ------------------------------------------------------------
+    # QAbstractItemModel interface
+    # ------------------------------------------------------------
+    def index(self, row, column, parent=QModelIndex()):
+        node = parent.internalPointer() if parent.isValid() else self.root
+        if not (0 <= row < self.rowCount(parent) and 0 <= column < len(HEADERS)):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        return self.node_index(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            node = parent.internalPointer()
+            return len(node.children) if parent.column() == 0 and node.shows_children() else 0
+        return len(self.root.children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(HEADERS)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Order siblings by a column; subtree columns put the heaviest subtrees first"""
+        self.sort_column = column
+        self.sort_descending = order == Qt.SortOrder.DescendingOrder
+        if self.columns is not None:
+            self.resort([self.root, *self.nodes.values()])
+
+    def hasChildren(self, parent=QModelIndex()):
+        # Unfetched groups still show an expander
+        if parent.isValid() and parent.internalPointer().group is not None:
+            return parent.column() == 0 and bool(parent.internalPointer().children)
+        return self.rowCount(parent) > 0
+
+    def canFetchMore(self, parent):
+        return parent.isValid() and not parent.internalPointer().shows_children()
+
+    def fetchMore(self, parent):
+        """List a group's members once it is expanded"""
+        if not self.canFetchMore(parent):
+            return
+        node = parent.internalPointer()
+        if node.children:
+            self.beginInsertRows(parent, 0, len(node.children) - 1)
+            node.fetched = True
+            self.endInsertRows()
+        else:
+            node.fetched = True
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return RIGHT if column in MONO_COLUMNS else None
+        if role == Qt.ItemDataRole.FontRole:
+            return self.mono_font if column in MONO_COLUMNS else None
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ForegroundRole,
+                        Qt.ItemDataRole.BackgroundRole):
+            return None
+
+        node = index.internalPointer()
+        if node.position is None and node.group is None:
+            return None
+        if role == Qt.ItemDataRole.BackgroundRole:
+            # Search hits stand out from the ancestors shown for context
+            matched = self.matches is not None and node.group is None and self.matches[node.position]
+            return self.match_brush if matched else None
+        if column in TOTAL_ATTRS:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self.display_total(node, column)
+            return self.brush(cpu_color(node.cpu_total)) if column == TREE_CPU else None
+        if node.group is not None:
+            return self.group_data(node, column, role)
+
+        process = self.columns[node.position]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display(process, column)
+        return self.foreground(process, column)
+
+    def display_total(self, node: TreeNode, column: int) -> str:
+        """Text of one subtree total cell"""
+        if column == TREE_CPU:
+            # Patched totals can drift a hair below zero
+            return f"{max(node.cpu_total, 0.0):.1f}%"
+        if column == TREE_RSS:
+            return format_bytes(node.rss_total)
+        if column == TREE_THREADS:
+            return str(node.threads_total)
+        return str(node.descendants)
+
+    def group_data(self, node: TreeNode, column: int, role):
+        """Text or color of one group cell: member count, summed usage, shared user"""
+        arrays = self.columns.arrays
+        # Exited members are still attached while an update is applied
+        positions = [child.position for child in node.children if child.position is not None]
+        if column in (CPU, MEM):
+            values = arrays[COLUMN_FIELDS[column]]
+            total = sum(values.item(position) for position in positions)
+            if role == Qt.ItemDataRole.DisplayRole:
+                return f"{total:.1f}%"
+            return self.brush(cpu_color(total)) if column == CPU else None
+        if column == USER:
+            users = {arrays["user"].item(position) for position in positions}
+            user = self.columns.strings[users.pop()][:15] if len(users) == 1 else ""
+            if role == Qt.ItemDataRole.DisplayRole:
+                return user
+            return self.brush("#ff6347") if user == "root" else None
+        if role == Qt.ItemDataRole.DisplayRole and column == NAME:
+            return f"{node.group} ×{len(node.children)}"
+        return None
+
+    def display(self, process: ProcessRow, column: int) -> str:
+        """Text of one process cell"""
+        if column == PID:
+            return str(process.pid)
+        if column == NAME:
+            return process.name
+        if column == CPU:
+            return f"{process.cpu:.1f}%"
+        if column == MEM:
+            return f"{process.mem:.1f}%"
+        if column == STATUS:
+            return process.status
+        return process.user[:15]
+
+    def foreground(self, process: ProcessRow, column: int) -> Optional[QBrush]:
+        """Text color of one cell"""
+        if column == CPU:
+            return self.brush(cpu_color(process.cpu))
+        if column == STATUS:
+            return self.brush(STATUS_COLORS.get(process.status, "#e0e0e0"))
+        if column == USER and process.user == "root":
+            return self.brush("#ff6347")
+        return None
@@ -2,9 +2,8 @@
 Process Tree View - Hierarchical process display with enhanced UI
 """
 
-import psutil
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QBrush, QColor, QFont
+import numpy as np
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QCheckBox,
     QFrame,
@@ -12,26 +11,31 @@ from PyQt6.QtWidgets import (
     QLabel,
     QLineEdit,
     QPushButton,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
     QVBoxLayout,
     QWidget,
 )
 
+from gui.views.process_tree_model import COLUMN_WIDTHS, PID, ProcessTreeModel
+from models.query import contains_mask, is_pid_text, pid_contains, with_ancestors
+
 
 class ProcessTreeView(QWidget):
     """Enhanced process tree view with modern styling"""
 
-    def __init__(self):
+    def __init__(self, snapshot_service):
         super().__init__()
         self.search_text = ""
         self.show_threads = False
+        self.snapshot = None
+        self.shown_seq = None  # Snapshot whose data the tree shows
+        self.shown_search = ""  # Search text whose matches the tree highlights
+        self.stale = False
+        self.snapshot_service = snapshot_service
         self.init_ui()
 
-        # Auto-refresh timer
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.populate_process_tree)
-        self.refresh_timer.start(3000)  # Refresh every 3 seconds
+        # Snapshots arrive from the shared background service
+        self.snapshot_service.subscribe(self.apply_snapshot)
 
     def init_ui(self):
         """Initialize UI with styling"""
@@ -39,11 +43,18 @@ class ProcessTreeView(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
 
-        # Tree widget with custom styling
-        self.tree_widget = QTreeWidget()
-        self.tree_widget.setHeaderLabels(
-            ["PID", "Process Name", "CPU%", "MEM%", "Status", "User"]
-        )
+        # Tree view over the snapshot, with custom styling
+        self.tree_model = ProcessTreeModel(self)
+        self.tree_widget = QTreeView()
+        self.tree_widget.setModel(self.tree_model)
+        # Large changes reset the model; expanded and selected nodes are put back
+        self.saved_state = ([], [])
+        self.tree_model.modelAboutToBeReset.connect(self.save_state)
+        self.tree_model.modelReset.connect(self.restore_state)
+        self.tree_widget.setUniformRowHeights(True)
+        # Header clicks sort siblings; the Tree columns rank whole subtrees
+        self.tree_widget.setSortingEnabled(True)
+        self.tree_widget.sortByColumn(PID, Qt.SortOrder.AscendingOrder)
         self.tree_widget.setAlternatingRowColors(True)
         self.tree_widget.setAnimated(True)
         self.tree_widget.setIndentation(20)
@@ -53,44 +64,40 @@ class ProcessTreeView(QWidget):
         layout.addWidget(control_bar)
 
         # Set column widths
-        self.tree_widget.setColumnWidth(0, 80)  # PID
-        self.tree_widget.setColumnWidth(1, 350)  # Process Name
-        self.tree_widget.setColumnWidth(2, 80)  # CPU%
-        self.tree_widget.setColumnWidth(3, 80)  # MEM%
-        self.tree_widget.setColumnWidth(4, 100)  # Status
-        self.tree_widget.setColumnWidth(5, 120)  # User
+        for column, width in COLUMN_WIDTHS.items():
+            self.tree_widget.setColumnWidth(column, width)
 
         # Apply dark theme styling
         self.tree_widget.setStyleSheet(
             """
-            QTreeWidget {
+            QTreeView {
                 background-color: #1a1a1a;
                 color: #e0e0e0;
                 border: none;
                 font-size: 11px;
                 outline: none;
             }
-            QTreeWidget::item {
+            QTreeView::item {
                 padding: 4px;
                 border: none;
             }
-            QTreeWidget::item:hover {
+            QTreeView::item:hover {
                 background-color: #2d2d2d;
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: #00d4ff;
                 color: #1a1a1a;
             }
-            QTreeWidget::branch {
+            QTreeView::branch {
                 background-color: #1a1a1a;
             }
-            QTreeWidget::branch:has-children:!has-siblings:closed,
-            QTreeWidget::branch:closed:has-children:has-siblings {
+            QTreeView::branch:has-children:!has-siblings:closed,
+            QTreeView::branch:closed:has-children:has-siblings {
                 border-image: none;
                 image: url(none);
             }
-            QTreeWidget::branch:open:has-children:!has-siblings,
-            QTreeWidget::branch:open:has-children:has-siblings {
+            QTreeView::branch:open:has-children:!has-siblings,
+            QTreeView::branch:open:has-children:has-siblings {
                 border-image: none;
                 image: url(none);
             }
@@ -126,9 +133,6 @@ class ProcessTreeView(QWidget):
 
         layout.addWidget(self.tree_widget)
 
-        # Initial population
-        self.populate_process_tree()
-
     def create_control_bar(self):
         """Create control bar with filters"""
         control_bar = QFrame()
@@ -204,11 +208,17 @@ class ProcessTreeView(QWidget):
         )
         layout.addWidget(self.threads_cb)
 
+        # Collapse same-named siblings into one expandable node
+        self.group_cb = QCheckBox("Group siblings")
+        self.group_cb.stateChanged.connect(self.on_grouping_changed)
+        self.group_cb.setStyleSheet(self.threads_cb.styleSheet())
+        layout.addWidget(self.group_cb)
+
         layout.addStretch()
 
         # Refresh button
         refresh_btn = QPushButton("🔄 Refresh")
-        refresh_btn.clicked.connect(self.populate_process_tree)
+        refresh_btn.clicked.connect(self.snapshot_service.request_refresh)
         refresh_btn.setStyleSheet(
             """
             QPushButton {
@@ -247,127 +257,107 @@ class ProcessTreeView(QWidget):
         """Handle search text changes"""
         self.search_text = text.lower()
         self.populate_process_tree()
+        # Searching shows every match; clearing goes back to the default depth
+        if self.search_text:
+            self.tree_widget.expandAll()
+        else:
+            self.tree_widget.expandToDepth(1)
 
     def on_threads_changed(self):
         """Handle threads checkbox change"""
         self.show_threads = self.threads_cb.isChecked()
         self.populate_process_tree()
 
-    def populate_process_tree(self):
-        """Populate the process tree with enhanced styling"""
-        self.tree_widget.clear()
-        processes = {}
-
-        # Collect all processes
-        for proc in psutil.process_iter(
-            [
-                "pid",
-                "ppid",
-                "name",
-                "cpu_percent",
-                "memory_percent",
-                "status",
-                "username",
-            ]
-        ):
-            try:
-                info = proc.info
-                pid = info["pid"]
-
-                # Apply search filter
-                if (
-                    self.search_text
-                    and self.search_text not in str(pid)
-                    and self.search_text not in info["name"].lower()
-                ):
-                    continue
-
-                processes[pid] = {
-                    "ppid": info["ppid"],
-                    "name": info["name"],
-                    "cpu": info.get("cpu_percent", 0.0),
-                    "mem": info.get("memory_percent", 0.0),
-                    "status": info.get("status", "unknown"),
-                    "user": info.get("username", "N/A")[:15],
-                    "item": None,
-                }
-            except (psutil.NoSuchProcess, psutil.AccessDenied, KeyError):
-                continue
-
-        # Create items for all processes
-        mono_font = QFont("Consolas", 9)
-
-        for pid, data in processes.items():
-            # Create item
-            cpu_str = f"{data['cpu']:.1f}%" if data["cpu"] else "0.0%"
-            mem_str = f"{data['mem']:.1f}%" if data["mem"] else "0.0%"
-
-            item = QTreeWidgetItem(
-                [str(pid), data["name"], cpu_str, mem_str, data["status"], data["user"]]
-            )
-
-            # Style the item
-            item.setFont(0, mono_font)  # PID
-            item.setTextAlignment(
-                0, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            )
-
-            item.setFont(2, mono_font)  # CPU%
-            item.setTextAlignment(
-                2, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            )
-
-            item.setFont(3, mono_font)  # MEM%
-            item.setTextAlignment(
-                3, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            )
-
-            # Color coding
-            # CPU color
-            cpu_val = data["cpu"]
-            if cpu_val > 50:
-                item.setForeground(2, QBrush(QColor("#ff6b6b")))
-            elif cpu_val > 20:
-                item.setForeground(2, QBrush(QColor("#ffd93d")))
-            else:
-                item.setForeground(2, QBrush(QColor("#51cf66")))
-
-            # Status color
-            status_colors = {
-                "running": "#51cf66",
-                "sleeping": "#4ecdc4",
-                "zombie": "#ff6b6b",
-                "stopped": "#ffd93d",
-                "idle": "#a0a0a0",
-            }
-            status_color = status_colors.get(data["status"], "#e0e0e0")
-            item.setForeground(4, QBrush(QColor(status_color)))
+    def on_grouping_changed(self):
+        """Handle group siblings checkbox change"""
+        self.tree_model.set_grouping(self.group_cb.isChecked())
+        self.populate_process_tree()
 
-            # Root user highlight
-            if data["user"] == "root":
-                item.setForeground(5, QBrush(QColor("#ff6347")))
+    def apply_snapshot(self, snapshot):
+        """Rebuild the tree from a snapshot published by the service"""
+        self.snapshot = snapshot
+        # Hidden tabs only keep the snapshot and catch up when shown
+        if not self.isVisible():
+            self.stale = True
+            return
+        self.populate_process_tree()
 
-            data["item"] = item
+    def showEvent(self, event):
+        """Render the latest snapshot if it arrived while hidden"""
+        super().showEvent(event)
+        if self.stale:
+            self.populate_process_tree()
 
-        # Build tree structure
-        root_items = []
-        for pid, data in processes.items():
-            ppid = data["ppid"]
-            item = data["item"]
+    def search_matches(self):
+        """Mask of the snapshot rows matching the search text (PID or process name), None if empty"""
+        if not self.search_text:
+            return None
+        columns = self.snapshot.processes
+        text = self.search_text
+        mask = contains_mask(columns, ("name",), text)
+        if is_pid_text(text):
+            mask |= pid_contains(columns.column("pid"), text)
+        return mask
 
-            if ppid in processes and processes[ppid]["item"]:
-                # Add as child to parent
-                processes[ppid]["item"].addChild(item)
-            else:
-                # Root process (no parent or parent not found)
-                root_items.append(item)
+    def populate_process_tree(self):
+        """Bring the tree up to date with the snapshot
 
-        # Add all root items to tree
-        self.tree_widget.addTopLevelItems(root_items)
+        Applied from the snapshot diff when the tree shows the previous
+        snapshot, so expanded and selected nodes are kept.
+        """
+        self.stale = False
+        if self.snapshot is None:
+            return
+
+        snapshot = self.snapshot
+        if self.shown_seq == snapshot.seq:
+            changed = {}
+        elif snapshot.diff is not None and self.shown_seq == snapshot.seq - 1:
+            changed = snapshot.diff.changed
+        else:
+            changed = None
+        # Another search moves the highlight to other rows
+        if self.shown_search != self.search_text:
+            changed = None
+
+        # Matches are shown under their ancestors, not as bare roots
+        matches = self.search_matches()
+        if matches is None:
+            rows = np.arange(len(snapshot.processes))
+        else:
+            rows = np.flatnonzero(with_ancestors(snapshot.processes, matches, snapshot.namespaces))
+
+        first = self.shown_seq is None
+        self.tree_model.set_matches(matches)
+        self.tree_model.set_namespaces(snapshot.namespaces)
+        self.tree_model.update(snapshot.processes, rows, changed)
+        self.shown_seq = snapshot.seq
+        self.shown_search = self.search_text
 
         # Expand first two levels by default
-        if not self.search_text:
+        if first:
             self.tree_widget.expandToDepth(1)
-        else:
-            # Expand all when searching
-            self.tree_widget.expandAll()
+
+    def save_state(self):
+        """Remember the expanded and selected nodes by key before a model reset"""
+        model = self.tree_model
+        expanded = [
+            node.key for node in model.root.walk()
+            if node.children and self.tree_widget.isExpanded(model.node_index(node))
+        ]
+        selected = [model.key(index) for index in self.tree_widget.selectionModel().selectedRows()]
+        self.saved_state = (expanded, selected)
+
+    def restore_state(self):
+        """Re-expand and reselect nodes by key after a model reset"""
+        model = self.tree_model
+        expanded, selected = self.saved_state
+        self.saved_state = ([], [])
+        for key in expanded:
+            index = model.key_index(key)
+            if index.isValid():
+                self.tree_widget.setExpanded(index, True)
+        for key in selected:
+            index = model.key_index(key)
+            if index.isValid():
+                self.tree_widget.setCurrentIndex(index)
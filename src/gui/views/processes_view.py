@@ -10,32 +10,51 @@ from datetime import datetime
 
 import psutil
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QBrush, QColor, QFont
-from PyQt6.QtWidgets import (QCheckBox, QComboBox, QFileDialog, QFrame,
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import (QApplication, QCheckBox, QComboBox, QFileDialog, QFrame,
                              QHBoxLayout, QHeaderView, QLabel, QMessageBox,
                              QProgressBar, QPushButton, QScrollArea,
-                             QTableWidget, QTableWidgetItem, QVBoxLayout,
-                             QWidget)
+                             QTableView, QVBoxLayout, QWidget)
 
-from models.process_model import ProcessModel, format_bytes, get_real_processes
+from gui.views.process_table_model import (COLUMN_FIELDS, COLUMN_WIDTHS,
+                                           COMMAND, CPU, DESCENDING_COLUMNS,
+                                           STATUS_COLORS, ProcessTableModel,
+                                           cpu_color)
+
+from models.process_model import ProcessDetails, ProcessModel, format_bytes
+from models.query import (IncrementalSearch, KernelThreadPredicate,
+                          NotPredicate, Query, QueryError, StringPredicate)
+
+# Row limit combo entry -> number of rows shown (None: all)
+ROW_LIMITS = {
+    "All": None,
+    "Top 25": 25,
+    "Top 50": 50,
+    "Top 100": 100,
+}
 
 
 class ProcessesView(QWidget):
     """Main processes view with table and details panel"""
 
-    def __init__(self, history_callback=None):
+    def __init__(self, snapshot_service, history_callback=None):
         super().__init__()
-        self.processes = []
-        self.filtered_processes = []
+        self.snapshot = None
+        self.search = IncrementalSearch()
         self.selected_process = None
+        self.selected_key = None  # (pid, create_time) of the selected process
+        self.shown_seq = None  # Snapshot whose data the table shows
         self.search_text = ""
+        self.sort = [(CPU, True)]  # (column, descending), primary first
+        self.refresh_pending = False
+        self.stale = False
         self.history_callback = history_callback
+        self.snapshot_service = snapshot_service
         self.init_ui()
 
-        # Start refresh timer
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_processes)
-        self.refresh_timer.start(2000)  # Refresh every 2 seconds
+        # Snapshots arrive from the shared background service
+        self.snapshot_service.subscribe(self.apply_snapshot)
+        self.snapshot_service.interval_changed.connect(self.update_interval_label)
 
     def init_ui(self):
         """Initialize UI components"""
@@ -64,9 +83,6 @@ class ProcessesView(QWidget):
         right_panel = self.create_details_panel()
         layout.addWidget(right_panel, 3)
 
-        # Load initial data
-        self.refresh_processes()
-
     def create_control_bar(self):
         """Create control bar with filters and options"""
         control_bar = QFrame()
@@ -79,15 +95,18 @@ class ProcessesView(QWidget):
         layout.setContentsMargins(16, 0, 16, 0)
         layout.setSpacing(16)
 
-        # Sort by
-        sort_label = QLabel("Sort by:")
-        sort_label.setStyleSheet("color: #a0a0a0; font-size: 11px;")
-        layout.addWidget(sort_label)
+        # Row limit; sorting is done by clicking the table headers
+        limit_label = QLabel("Show:")
+        limit_label.setStyleSheet("color: #a0a0a0; font-size: 11px;")
+        layout.addWidget(limit_label)
 
-        self.sort_combo = QComboBox()
-        self.sort_combo.addItems(["CPU%", "Memory%", "PID", "Name"])
-        self.sort_combo.currentTextChanged.connect(self.apply_filters)
-        layout.addWidget(self.sort_combo)
+        self.limit_combo = QComboBox()
+        self.limit_combo.addItems(list(ROW_LIMITS))
+        self.limit_combo.setToolTip(
+            "Sort by clicking a column header; Shift+click adds a secondary sort column"
+        )
+        self.limit_combo.currentTextChanged.connect(self.apply_filters)
+        layout.addWidget(self.limit_combo)
 
         # Checkboxes
         self.root_only_cb = QCheckBox("Root only")
@@ -98,11 +117,18 @@ class ProcessesView(QWidget):
         self.hide_kernel_cb.stateChanged.connect(self.apply_filters)
         layout.addWidget(self.hide_kernel_cb)
 
-        self.auto_refresh_cb = QCheckBox("Auto-refresh (2s)")
+        self.auto_refresh_cb = QCheckBox(
+            f"Auto-refresh ({self.snapshot_service.interval / 1000:.1f}s)"
+        )
         self.auto_refresh_cb.setChecked(True)
         self.auto_refresh_cb.stateChanged.connect(self.toggle_auto_refresh)
         layout.addWidget(self.auto_refresh_cb)
 
+        self.query_error_label = QLabel()
+        self.query_error_label.setStyleSheet("color: #ff6b6b; font-size: 11px;")
+        self.query_error_label.hide()
+        layout.addWidget(self.query_error_label)
+
         layout.addStretch()
 
         # Export button
@@ -114,182 +140,150 @@ class ProcessesView(QWidget):
         return control_bar
 
     def create_process_table(self):
-        """Create the process table"""
-        table = QTableWidget()
-        table.setColumnCount(10)
-        table.setHorizontalHeaderLabels(
-            [
-                "PID",
-                "User",
-                "CPU%",
-                "MEM%",
-                "VSZ",
-                "RSS",
-                "Status",
-                "Threads",
-                "Priority",
-                "Command",
-            ]
-        )
+        """Create the process table, backed by a model over the snapshot"""
+        self.table_model = ProcessTableModel(self)
+
+        table = QTableView()
+        table.setModel(self.table_model)
+        table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setDefaultSectionSize(24)
 
         # Set column widths
         header = table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(0, 70)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(1, 100)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(2, 80)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(3, 80)
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(4, 90)
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(5, 90)
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(6, 90)
-        header.setSectionResizeMode(7, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(7, 70)
-        header.setSectionResizeMode(8, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(8, 70)
-        header.setSectionResizeMode(9, QHeaderView.ResizeMode.Stretch)
+        for column, width in COLUMN_WIDTHS.items():
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Fixed)
+            header.resizeSection(column, width)
+        header.setSectionResizeMode(COMMAND, QHeaderView.ResizeMode.Stretch)
+        header.setSectionsClickable(True)
+        header.sectionClicked.connect(self.on_header_clicked)
+        self.table_model.set_sort(self.sort)
 
         # Enable alternating row colors
         table.setAlternatingRowColors(True)
 
         # Connect selection
-        table.itemSelectionChanged.connect(self.on_process_selected)
+        table.selectionModel().selectionChanged.connect(self.on_process_selected)
 
         return table
 
     def refresh_processes(self):
-        """Refresh process list from system"""
-        # Get real processes
-        self.processes = get_real_processes()
+        """Queue a process list refresh on the snapshot service"""
+        self.refresh_pending = True
+        self.snapshot_service.request_refresh()
+
+    def apply_snapshot(self, snapshot):
+        """Apply a finished snapshot from the snapshot service"""
+        # With auto-refresh off, only explicitly requested refreshes apply
+        if not self.auto_refresh_cb.isChecked() and not self.refresh_pending:
+            return
+        self.refresh_pending = False
+
+        # Nothing changed since the snapshot on screen - skip the redraw
+        unchanged = (
+            self.snapshot is not None
+            and snapshot.diff is not None
+            and snapshot.diff.is_empty()
+            and snapshot.seq == self.snapshot.seq + 1
+        )
+        if unchanged:
+            if self.shown_seq == self.snapshot.seq:
+                self.shown_seq = snapshot.seq
+            self.snapshot = snapshot
+            return
+        self.snapshot = snapshot
+
+        # Hidden tabs only keep the snapshot and catch up when shown
+        if not self.isVisible():
+            self.stale = True
+            return
+        self.stale = False
         self.apply_filters()
 
-    def apply_filters(self):
-        """Apply filters and sorting to process list"""
-        filtered = self.processes.copy()
+    def showEvent(self, event):
+        """Render the latest snapshot if it arrived while hidden"""
+        super().showEvent(event)
+        if self.stale:
+            self.stale = False
+            self.apply_filters()
 
-        # Apply root only filter
+    def build_query(self):
+        """Compile the search text and the filter checkboxes into one query"""
+        query = Query.parse(self.search_text)
         if self.root_only_cb.isChecked():
-            filtered = [p for p in filtered if p.user == "root"]
-
-        # Apply hide kernel threads filter
+            query = query.extended(StringPredicate("user", "=", "root"))
         if self.hide_kernel_cb.isChecked():
-            filtered = [p for p in filtered if not p.command.startswith("[")]
-
-        # Apply search filter
-        if self.search_text:
-            search_lower = self.search_text.lower()
-            filtered = [
-                p
-                for p in filtered
-                if search_lower in p.command.lower()
-                or search_lower in str(p.pid)
-                or search_lower in p.user.lower()
-            ]
-
-        # Apply sorting
-        sort_by = self.sort_combo.currentText()
-        if sort_by == "CPU%":
-            filtered.sort(key=lambda x: x.cpu, reverse=True)
-        elif sort_by == "Memory%":
-            filtered.sort(key=lambda x: x.mem, reverse=True)
-        elif sort_by == "PID":
-            filtered.sort(key=lambda x: x.pid)
-        elif sort_by == "Name":
-            filtered.sort(key=lambda x: x.command.lower())
-
-        self.filtered_processes = filtered
-        self.populate_table()
-
-    def populate_table(self):
-        """Populate the process table with data"""
-        self.process_table.setRowCount(len(self.filtered_processes))
+            query = query.extended(NotPredicate(KernelThreadPredicate()))
+        return query
 
-        mono_font = QFont("Consolas", 9)
+    def apply_filters(self):
+        """Apply filters and sorting to process list"""
+        if self.snapshot is None:
+            return
+        try:
+            query = self.build_query()
+        except QueryError as e:
+            # Keep the last valid result on screen while the user types
+            self.query_error_label.setText(f"⚠ {e}")
+            self.query_error_label.show()
+            return
+        self.query_error_label.hide()
+
+        columns = self.snapshot.processes
+        sort = [(COLUMN_FIELDS[column], descending) for column, descending in self.sort]
+        rows = self.search.run(columns, query, sort, ROW_LIMITS[self.limit_combo.currentText()])
+        self.populate_table(rows)
+
+    def on_header_clicked(self, column):
+        """Sort by a clicked column; Shift+click adds or flips a secondary column"""
+        sort = dict(self.sort)
+        if QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier:
+            if column in sort:
+                sort[column] = not sort[column]
+            else:
+                sort[column] = column in DESCENDING_COLUMNS
+            self.sort = list(sort.items())
+        elif self.sort[0][0] == column:
+            self.sort = [(column, not self.sort[0][1])]
+        else:
+            self.sort = [(column, column in DESCENDING_COLUMNS)]
+        self.table_model.set_sort(self.sort)
+        self.apply_filters()
 
-        for row, process in enumerate(self.filtered_processes):
-            # PID
-            pid_item = QTableWidgetItem(str(process.pid))
-            pid_item.setTextAlignment(
-                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            )
-            pid_item.setFont(mono_font)
-            self.process_table.setItem(row, 0, pid_item)
-
-            # User
-            user_item = QTableWidgetItem(process.user[:15])
-            if process.user == "root":
-                user_item.setForeground(QBrush(QColor("#ff6347")))
-            self.process_table.setItem(row, 1, user_item)
-
-            # CPU%
-            cpu_item = QTableWidgetItem(f"{process.cpu:.1f}")
-            cpu_item.setTextAlignment(
-                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            )
-            cpu_item.setFont(mono_font)
-            cpu_color = self.get_cpu_color(process.cpu)
-            cpu_item.setForeground(QBrush(QColor(cpu_color)))
-            if process.cpu > 70:
-                cpu_item.setBackground(QBrush(QColor("#ff6b6b").darker(300)))
-            self.process_table.setItem(row, 2, cpu_item)
-
-            # MEM%
-            mem_item = QTableWidgetItem(f"{process.mem:.1f}")
-            mem_item.setTextAlignment(
-                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            )
-            mem_item.setFont(mono_font)
-            if process.mem > 10:
-                mem_item.setBackground(QBrush(QColor("#ff6b6b").darker(300)))
-            self.process_table.setItem(row, 3, mem_item)
-
-            # VSZ
-            vsz_item = QTableWidgetItem(format_bytes(process.vsz))
-            vsz_item.setTextAlignment(
-                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            )
-            vsz_item.setFont(mono_font)
-            vsz_item.setForeground(QBrush(QColor("#a0a0a0")))
-            self.process_table.setItem(row, 4, vsz_item)
-
-            # RSS
-            rss_item = QTableWidgetItem(format_bytes(process.rss))
-            rss_item.setTextAlignment(
-                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            )
-            rss_item.setFont(mono_font)
-            rss_item.setForeground(QBrush(QColor("#a0a0a0")))
-            self.process_table.setItem(row, 5, rss_item)
-
-            # Status
-            status_item = QTableWidgetItem(process.status)
-            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            status_color = self.get_status_color(process.status)
-            status_item.setForeground(QBrush(QColor(status_color)))
-            self.process_table.setItem(row, 6, status_item)
-
-            # Threads
-            threads_item = QTableWidgetItem(str(process.threads))
-            threads_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            threads_item.setFont(mono_font)
-            self.process_table.setItem(row, 7, threads_item)
-
-            # Priority
-            priority_item = QTableWidgetItem(str(process.priority))
-            priority_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            priority_item.setFont(mono_font)
-            priority_color = "#51cf66" if process.priority < 0 else "#a0a0a0" if process.priority == 0 else "#ff6b6b"
-            priority_item.setForeground(QBrush(QColor(priority_color)))
-            self.process_table.setItem(row, 8, priority_item)
-
-            # Command
-            cmd_item = QTableWidgetItem(process.command[:80])
-            self.process_table.setItem(row, 9, cmd_item)
+    def populate_table(self, rows):
+        """Show the given snapshot rows in the process table
+
+        Updates are applied from the snapshot diff when the table shows the
+        previous snapshot, so only changed cells repaint and the selection
+        follows its process.
+        """
+        snapshot = self.snapshot
+        if self.shown_seq == snapshot.seq:
+            changed = {}
+        elif snapshot.diff is not None and self.shown_seq == snapshot.seq - 1:
+            changed = snapshot.diff.changed
+        else:
+            changed = None
+
+        scroll_bar = self.process_table.verticalScrollBar()
+        scroll = scroll_bar.value()
+        if not self.table_model.update(snapshot.processes, rows, changed):
+            # The model was reset; put the selection and scroll position back
+            scroll_bar.setValue(scroll)
+            self.restore_selection()
+        self.shown_seq = snapshot.seq
+
+        if self.selected_key is not None:
+            self.selected_process = snapshot.process(self.selected_key) or self.selected_process
+
+    def restore_selection(self):
+        """Reselect the selected process after a model reset, if still shown"""
+        if self.selected_key is None:
+            return
+        row = self.table_model.find(self.selected_key)
+        if row >= 0:
+            self.process_table.selectRow(row)
 
     def create_details_panel(self):
         """Create the right details panel"""
@@ -637,7 +631,7 @@ class ProcessesView(QWidget):
                     ]
                 )
 
-                for process in self.filtered_processes:
+                for process in self.table_model.iter_processes():
                     writer.writerow(
                         [
                             process.pid,
@@ -656,7 +650,7 @@ class ProcessesView(QWidget):
             QMessageBox.information(
                 self,
                 "Success",
-                f"Exported {len(self.filtered_processes)} processes to:\n{filename}",
+                f"Exported {self.table_model.rowCount()} processes to:\n{filename}",
             )
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to export: {str(e)}")
@@ -664,9 +658,11 @@ class ProcessesView(QWidget):
     def toggle_auto_refresh(self):
         """Toggle auto refresh on/off"""
         if self.auto_refresh_cb.isChecked():
-            self.refresh_timer.start(2000)
-        else:
-            self.refresh_timer.stop()
+            self.refresh_processes()
+
+    def update_interval_label(self, interval):
+        """Show the effective refresh interval (ms)"""
+        self.auto_refresh_cb.setText(f"Auto-refresh ({interval / 1000:.1f}s)")
 
     def set_search_text(self, text):
         """Set search text from main window"""
@@ -675,13 +671,18 @@ class ProcessesView(QWidget):
 
     def on_process_selected(self):
         """Handle process selection"""
-        selection = self.process_table.selectedItems()
+        selection = self.process_table.selectionModel().selectedRows()
         if not selection:
             return
 
-        row = selection[0].row()
-        if row < len(self.filtered_processes):
-            self.selected_process = self.filtered_processes[row]
+        process = self.table_model.process(selection[0].row())
+        if process is None:
+            return
+        key = (process.pid, process.create_time)
+        self.selected_process = process
+        # Reselection of the same process after a refresh keeps the panel
+        if key != self.selected_key:
+            self.selected_key = key
             self.update_details_panel()
 
     def update_details_panel(self):
@@ -741,9 +742,14 @@ class ProcessesView(QWidget):
         )
         self.details_layout.addWidget(cmd_label)
 
+        # Expensive fields are collected only for the selected process
+        details = self.snapshot.get_details(p.pid) if self.snapshot else None
+        if details is None:
+            details = ProcessDetails(cwd=p.cwd, open_files=p.open_files, network_conns=p.network_conns)
+
         # Working Directory
         self.add_section_header("Working Directory", "#00d4ff")
-        cwd_label = QLabel(p.cwd)
+        cwd_label = QLabel(details.cwd)
         cwd_label.setWordWrap(True)
         cwd_label.setStyleSheet(
             "color: #a0a0a0; font-family: monospace; font-size: 10px;"
@@ -752,8 +758,8 @@ class ProcessesView(QWidget):
 
         # Files & Connections
         self.add_section_header("Files & Connections", "#ffa500")
-        self.add_detail_row("Open files:", str(p.open_files), mono_font)
-        self.add_detail_row("Network connections:", str(p.network_conns), mono_font)
+        self.add_detail_row("Open files:", str(details.open_files), mono_font)
+        self.add_detail_row("Network connections:", str(details.network_conns), mono_font)
 
         self.details_layout.addStretch()
 
@@ -808,22 +814,8 @@ class ProcessesView(QWidget):
 
     def get_cpu_color(self, cpu):
         """Get color for CPU usage"""
-        if cpu > 70:
-            return "#ff6b6b"
-        elif cpu > 40:
-            return "#ffd93d"
-        else:
-            return "#51cf66"
+        return cpu_color(cpu)
 
     def get_status_color(self, status):
         """Get color for process status"""
-        status_colors = {
-            "running": "#51cf66",
-            "sleeping": "#4ecdc4",
-            "zombie": "#ff6b6b",
-            "stopped": "#ffd93d",
-            "dead": "#ff6b6b",
-            "disk-sleep": "#4ecdc4",
-            "idle": "#a0a0a0",
-        }
-        return status_colors.get(status, "#e0e0e0")
+        return STATUS_COLORS.get(status, "#e0e0e0")
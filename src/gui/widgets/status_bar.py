@@ -43,7 +43,14 @@ class StatusBar(QFrame):
         # Spacer
         layout.addStretch()
         
-        # Right side - Process count and time
+        # Right side - Refresh interval, process count and time
+        self.interval_label = QLabel()
+        self.interval_label.setStyleSheet("color: #a0a0a0; font-size: 11px;")
+        self.update_interval(2000)
+        layout.addWidget(self.interval_label)
+        
+        layout.addWidget(self.create_separator())
+        
         self.process_count_label = QLabel("Processes: 287")
         self.process_count_label.setStyleSheet("color: #a0a0a0; font-size: 11px;")
         layout.addWidget(self.process_count_label)
@@ -63,31 +70,36 @@ class StatusBar(QFrame):
         separator.setStyleSheet("background-color: #3a3a3a;")
         return separator
     
-    def update_stats(self, process_count=None):
-        """Update status bar statistics with real system data"""
-        import psutil
-        
-        # Get real system stats
-        cpu = psutil.cpu_percent(interval=0.1)
-        mem = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+    def update_stats(self, snapshot):
+        """Update status bar statistics from a system snapshot"""
+        system = snapshot.system
+        cpu = system['cpu_percent']
         
         # Format memory
-        mem_used_gb = mem.used / (1024**3)
-        mem_total_gb = mem.total / (1024**3)
+        mem_used_gb = system['mem_used'] / (1024**3)
+        mem_total_gb = system['mem_total'] / (1024**3)
         
         cpu_color = "#51cf66" if cpu < 70 else "#ffd93d" if cpu < 85 else "#ff6b6b"
         
         self.cpu_label.setText(f"💻 CPU: {cpu:.1f}%")
         self.cpu_label.setStyleSheet(f"color: {cpu_color}; font-size: 11px;")
+        cores = "\n".join(
+            f"Core {i}: {value:.1f}%" for i, value in enumerate(system['cpu_per_core'])
+        )
+        self.cpu_label.setToolTip(
+            f"I/O wait: {system['cpu_iowait']:.1f}%\nSteal: {system['cpu_steal']:.1f}%\n{cores}"
+        )
         
-        self.memory_label.setText(f"💾 Memory: {mem.percent:.1f}% ({mem_used_gb:.1f}GB / {mem_total_gb:.1f}GB)")
+        self.memory_label.setText(f"💾 Memory: {system['mem_percent']:.1f}% ({mem_used_gb:.1f}GB / {mem_total_gb:.1f}GB)")
         
-        self.disk_label.setText(f"💿 Disk: {disk.percent:.1f}%")
+        self.disk_label.setText(f"💿 Disk: {system['disk_percent']:.1f}%")
         
-        # Update process count if provided
-        if process_count is not None:
-            self.process_count_label.setText(f"Processes: {process_count}")
-        
-        # Update time
+        self.process_count_label.setText(f"Processes: {len(snapshot.processes)}")
+    
+    def update_interval(self, interval):
+        """Show the effective refresh interval (ms)"""
+        self.interval_label.setText(f"Refresh: {interval / 1000:.1f}s")
+    
+    def update_clock(self):
+        """Update the clock"""
         self.time_label.setText(datetime.now().strftime("%H:%M:%S"))
@@ -54,7 +54,12 @@ class TopBar(QFrame):
         
         # Center - Search
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Filter processes by name, PID, or command...")
+        self.search_input.setPlaceholderText('Filter: name, PID or e.g. cpu>20 user=root cmd~"py.*"')
+        self.search_input.setToolTip(
+            "Words match the command, user or PID.\n"
+            "Fields: pid ppid cpu mem rss vsz threads prio (= != > >= < <=),\n"
+            "user cmd name status (= != exact, ~ !~ regex). Sizes: rss>1G"
+        )
         self.search_input.setMaximumWidth(400)
         self.search_input.textChanged.connect(self.search_changed.emit)
         layout.addWidget(self.search_input)
@@ -0,0 +1,212 @@
+"""
+Columnar process store - one NumPy structured array per snapshot instead of
+a list of ProcessModel objects.
+
+Numeric fields live in the array; text fields (user, status, command, name,
+created) are stored as codes into a per-snapshot interned string table, so
+repeated values such as user names and statuses are kept once. ProcessRow
+is a thin view over one row that exposes the ProcessModel attributes, so
+existing callers keep working.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List
+
+import numpy as np
+
+from models.process_model import ProcessModel
+
+NUMERIC_FIELDS = (
+    "pid", "ppid", "cpu", "mem", "vsz", "rss", "threads", "priority",
+    "cpu_time_user", "cpu_time_sys", "create_time",
+)
+STRING_FIELDS = ("user", "status", "command", "name", "created")
+
+PROCESS_DTYPE = np.dtype([
+    ("pid", np.int32),
+    ("ppid", np.int32),
+    ("cpu", np.float64),
+    ("mem", np.float64),
+    ("vsz", np.uint64),
+    ("rss", np.uint64),
+    ("threads", np.int32),
+    ("priority", np.int32),
+    ("cpu_time_user", np.float64),
+    ("cpu_time_sys", np.float64),
+    ("create_time", np.float64),
+    # Codes into ProcessColumns.strings
+    ("user", np.uint32),
+    ("status", np.uint32),
+    ("command", np.uint32),
+    ("name", np.uint32),
+    ("created", np.uint32),
+])
+
+# Order of the values in a packed row tuple
+_ROW_FIELDS = PROCESS_DTYPE.names
+
+
+class ProcessColumns:
+    """Immutable columnar table of processes.
+
+    Iterating or indexing yields ProcessRow views; column() gives the raw
+    NumPy arrays for vectorized filtering and sorting.
+    """
+
+    def __init__(self, data: np.ndarray, strings: List[str]):
+        self.data = data
+        self.strings = strings
+        # Field views are cached; data[name] builds a new view on every call
+        self.arrays: Dict[str, np.ndarray] = {name: data[name] for name in _ROW_FIELDS}
+        self._codes = None
+        self._derived: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def from_processes(cls, processes: Iterable[ProcessModel]) -> "ProcessColumns":
+        """Pack ProcessModel-like objects into columns, interning their strings"""
+        codes: Dict[str, int] = {}
+        intern = codes.setdefault
+        # Rows are packed one at a time; no intermediate list of tuples
+        rows = (
+            (
+                p.pid, p.ppid, p.cpu, p.mem, p.vsz, p.rss, p.threads, p.priority,
+                p.cpu_time_user, p.cpu_time_sys, p.create_time,
+                intern(p.user, len(codes)),
+                intern(p.status, len(codes)),
+                intern(p.command, len(codes)),
+                intern(p.name, len(codes)),
+                intern(p.created, len(codes)),
+            )
+            for p in processes
+        )
+        data = np.fromiter(rows, dtype=PROCESS_DTYPE)
+        columns = cls(data, list(codes))
+        columns._codes = codes
+        return columns
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> "ProcessRow":
+        if index < 0:
+            index += len(self.data)
+        if not 0 <= index < len(self.data):
+            raise IndexError(index)
+        return ProcessRow(self, index)
+
+    def __iter__(self) -> Iterator["ProcessRow"]:
+        for index in range(len(self.data)):
+            yield ProcessRow(self, index)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the array and the string table (string objects excluded)"""
+        return self.data.nbytes + len(self.strings) * 8
+
+    @property
+    def string_codes(self) -> Dict[str, int]:
+        """String -> code mapping of the string table"""
+        if self._codes is None:
+            self._codes = {text: code for code, text in enumerate(self.strings)}
+        return self._codes
+
+    def derive(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return a value computed from this table, computing it on first use"""
+        if key not in self._derived:
+            self._derived[key] = factory()
+        return self._derived[key]
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a field as an array (string fields as codes)"""
+        return self.arrays[name]
+
+    def string_column(self, name: str) -> np.ndarray:
+        """Return a string field decoded into an object array"""
+        table = np.array(self.strings, dtype=object)
+        return table[self.arrays[name]] if len(table) else np.empty(0, dtype=object)
+
+    def translate_codes(self, other: "ProcessColumns") -> np.ndarray:
+        """Map other's string codes to codes of this table (-1 where missing)"""
+        codes = self.string_codes
+        return np.array([codes.get(text, -1) for text in other.strings], dtype=np.int64)
+
+    def keys(self) -> List[tuple]:
+        """(pid, create_time) identity key of every row"""
+        return list(zip(self.arrays["pid"].tolist(), self.arrays["create_time"].tolist()))
+
+    def to_models(self) -> List[ProcessModel]:
+        """Materialize every row as a ProcessModel"""
+        return [row.to_model() for row in self]
+
+
+def _numeric_field(name):
+    def get(self):
+        return self._columns.arrays[name].item(self._index)
+    return property(get)
+
+
+def _string_field(name):
+    def get(self):
+        columns = self._columns
+        return columns.strings[columns.arrays[name].item(self._index)]
+    return property(get)
+
+
+class ProcessRow:
+    """Read-only view of one process in a ProcessColumns table.
+
+    Exposes the same attributes as ProcessModel; the expensive on-demand
+    fields keep their ProcessModel defaults.
+    """
+
+    __slots__ = ("_columns", "_index")
+
+    cwd = "N/A"
+    open_files = 0
+    network_conns = 0
+
+    def __init__(self, columns: ProcessColumns, index: int):
+        self._columns = columns
+        self._index = index
+
+    @property
+    def row_index(self) -> int:
+        """Position of this row in its table"""
+        return self._index
+
+    def to_model(self) -> ProcessModel:
+        """Copy this row into a standalone ProcessModel"""
+        return ProcessModel(
+            pid=self.pid,
+            user=self.user,
+            cpu=self.cpu,
+            mem=self.mem,
+            vsz=self.vsz,
+            rss=self.rss,
+            status=self.status,
+            threads=self.threads,
+            command=self.command,
+            ppid=self.ppid,
+            created=self.created,
+            cpu_time_user=self.cpu_time_user,
+            cpu_time_sys=self.cpu_time_sys,
+            priority=self.priority,
+            name=self.name,
+            create_time=self.create_time,
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, ProcessRow):
+            return self._columns is other._columns and self._index == other._index
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._columns), self._index))
+
+    def __repr__(self):
+        return f"ProcessRow(pid={self.pid}, name={self.name!r}, cpu={self.cpu:.1f})"
+
+
+for _name in NUMERIC_FIELDS:
+    setattr(ProcessRow, _name, _numeric_field(_name))
+for _name in STRING_FIELDS:
+    setattr(ProcessRow, _name, _string_field(_name))
@@ -0,0 +1,82 @@
+"""
+Non-blocking CPU sampler - reads /proc/stat once per tick and derives total,
+per-core, iowait and steal utilization from the deltas between ticks
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from models.procfs import PROC_ROOT, read_file
+
+# Columns of the cpu lines in /proc/stat
+USER, NICE, SYSTEM, IDLE, IOWAIT, IRQ, SOFTIRQ, STEAL = range(8)
+
+
+@dataclass(frozen=True)
+class CpuSample:
+    """CPU utilization (percent) over the interval since the previous sample"""
+    percent: float
+    per_core: Tuple[float, ...]
+    iowait: float
+    steal: float
+
+
+def parse_cpu_times(data: bytes) -> List[Tuple[int, ...]]:
+    """Parse the aggregate and per-core cpu lines of /proc/stat.
+
+    Returns the aggregate line first, then one entry per core, each with
+    the first eight columns (user .. steal; guest time is part of user).
+    """
+    times = []
+    for line in data.split(b"\n"):
+        if not line.startswith(b"cpu"):
+            if times:
+                break
+            continue
+        fields = line.split()[1:9]
+        times.append(tuple(int(value) for value in fields) + (0,) * (8 - len(fields)))
+    return times
+
+
+def utilization(old: Tuple[int, ...], new: Tuple[int, ...]) -> Tuple[float, float, float]:
+    """Busy, iowait and steal percent between two cpu lines.
+
+    Like psutil, iowait counts as idle time when computing busy time.
+    """
+    deltas = [max(b - a, 0) for a, b in zip(old, new)]
+    total = sum(deltas)
+    if not total:
+        return 0.0, 0.0, 0.0
+    busy = total - deltas[IDLE] - deltas[IOWAIT]
+    return (
+        busy / total * 100,
+        deltas[IOWAIT] / total * 100,
+        deltas[STEAL] / total * 100,
+    )
+
+
+class CpuSampler:
+    """Computes CPU utilization from /proc/stat deltas without sleeping.
+
+    The first sample covers the time since boot; later samples cover the
+    time since the previous call.
+    """
+
+    def __init__(self, proc_root: str = PROC_ROOT):
+        self.path = f"{proc_root}/stat"
+        self.previous: Optional[List[Tuple[int, ...]]] = None
+
+    def sample(self) -> CpuSample:
+        """Read /proc/stat once and return utilization since the last sample"""
+        times = parse_cpu_times(read_file(self.path, 65536))
+        previous = self.previous
+        # Cores going offline/online change the line count; start over
+        if previous is None or len(previous) != len(times):
+            previous = [(0,) * 8] * len(times)
+        self.previous = times
+
+        percent, iowait, steal = utilization(previous[0], times[0])
+        per_core = tuple(
+            utilization(old, new)[0] for old, new in zip(previous[1:], times[1:])
+        )
+        return CpuSample(percent=percent, per_core=per_core, iowait=iowait, steal=steal)
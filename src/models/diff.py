@@ -0,0 +1,79 @@
+"""
+Snapshot diff engine - computes which processes appeared, exited or changed
+between two consecutive snapshots
+"""
+
+from dataclasses import dataclass, fields
+from typing import Dict, FrozenSet, Tuple
+
+import numpy as np
+
+from models.columnar import STRING_FIELDS, ProcessColumns
+from models.process_model import ProcessModel
+
+# A process is identified by (pid, create_time) so a reused PID is reported
+# as one exit plus one new process rather than as a change
+ProcessKey = Tuple[int, float]
+
+# Fields compared between snapshots; the expensive on-demand fields are
+# never filled by the tiered collectors and are left out
+DIFF_FIELDS = tuple(
+    f.name for f in fields(ProcessModel)
+    if f.name not in ("pid", "create_time", "cwd", "open_files", "network_conns")
+)
+
+
+def index_columns(columns: ProcessColumns) -> Dict[ProcessKey, int]:
+    """Index the rows of a columnar table by identity key -> row position"""
+    return {key: position for position, key in enumerate(columns.keys())}
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    """Changes between two snapshots"""
+    added: Tuple[ProcessKey, ...]
+    exited: Tuple[ProcessKey, ...]
+    changed: Dict[ProcessKey, FrozenSet[str]]  # Key -> names of changed fields
+
+    def is_empty(self) -> bool:
+        """Return True when nothing changed"""
+        return not (self.added or self.exited or self.changed)
+
+
+def diff_columns(
+    old: ProcessColumns, old_index: Dict[ProcessKey, int],
+    new: ProcessColumns, new_index: Dict[ProcessKey, int],
+) -> SnapshotDiff:
+    """Diff two columnar tables, comparing each field as one array operation"""
+    added = tuple(key for key in new_index if key not in old_index)
+    exited = tuple(key for key in old_index if key not in new_index)
+
+    common = [key for key in new_index if key in old_index]
+    if not common:
+        return SnapshotDiff(added=added, exited=exited, changed={})
+    old_rows = np.fromiter((old_index[key] for key in common), dtype=np.intp, count=len(common))
+    new_rows = np.fromiter((new_index[key] for key in common), dtype=np.intp, count=len(common))
+
+    # The string tables differ per snapshot, so old codes are translated first
+    translate = new.translate_codes(old)
+    changes = np.empty((len(common), len(DIFF_FIELDS)), dtype=bool)
+    for column, name in enumerate(DIFF_FIELDS):
+        before = old.arrays[name][old_rows]
+        if name in STRING_FIELDS:
+            before = translate[before]
+        np.not_equal(before, new.arrays[name][new_rows], out=changes[:, column])
+
+    # Rows with the same set of changed fields share one frozenset
+    field_sets = {}
+    changed = {}
+    for row in np.flatnonzero(changes.any(axis=1)).tolist():
+        mask = changes[row].tobytes()
+        names = field_sets.get(mask)
+        if names is None:
+            names = frozenset(
+                DIFF_FIELDS[column] for column in np.flatnonzero(changes[row]).tolist()
+            )
+            field_sets[mask] = names
+        changed[common[row]] = names
+
+    return SnapshotDiff(added=added, exited=exited, changed=changed)
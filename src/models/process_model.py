@@ -2,11 +2,15 @@
 Process data model with real-time psutil integration
 """
 
+import atexit
+import os
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 import psutil
 
+from models.static_cache import StaticCache, StaticInfo
+
 
 @dataclass
 class ProcessModel:
@@ -24,10 +28,22 @@ class ProcessModel:
     created: str
     cpu_time_user: float
     cpu_time_sys: float
+    priority: int
+    name: str
+    create_time: float  # Epoch seconds; with pid identifies a process across PID reuse
+    # Expensive fields - only filled by the full psutil path, the tiered
+    # collectors fetch them on demand as ProcessDetails
+    cwd: str = "N/A"
+    open_files: int = 0
+    network_conns: int = 0
+
+
+@dataclass(frozen=True)
+class ProcessDetails:
+    """Expensive per-process fields collected on demand"""
     cwd: str
     open_files: int
     network_conns: int
-    priority: int
 
 
 def format_bytes(bytes_value):
@@ -39,43 +55,106 @@ def format_bytes(bytes_value):
     return f"{bytes_value:.1f}PB"
 
 
-def get_process_info(proc: psutil.Process) -> Optional[ProcessModel]:
-    """Extract process information safely from psutil Process"""
+def get_psutil_details(proc: psutil.Process) -> ProcessDetails:
+    """Collect the expensive fields of a psutil Process"""
+    # Get working directory
+    try:
+        cwd = proc.cwd()
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        cwd = "N/A"
+    
+    # Get open files count
+    try:
+        open_files = len(proc.open_files())
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        open_files = 0
+    
+    # Get network connections count
+    try:
+        network_conns = len(proc.connections())
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        network_conns = 0
+    
+    return ProcessDetails(cwd=cwd, open_files=open_files, network_conns=network_conns)
+
+
+def get_process_details(pid: int) -> Optional[ProcessDetails]:
+    """Collect the expensive fields (cwd, open files, connections) of one process"""
+    from models import procfs
+
+    if procfs.is_available():
+        return procfs.read_process_details(pid)
+
+    try:
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            return get_psutil_details(proc)
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+
+def get_psutil_static(proc: psutil.Process, start_time: float) -> StaticInfo:
+    """Collect the attributes of a psutil Process that never change"""
+    # Get command line
+    try:
+        cmdline = proc.cmdline()
+        command = ' '.join(cmdline) if cmdline else proc.name()
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        command = f"[{proc.name()}]"
+    
+    # Get username
+    try:
+        username = proc.username()
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        username = "N/A"
+    
+    # Format creation time
+    if start_time:
+        create_time = datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S')
+    else:
+        create_time = "N/A"
+    
+    return StaticInfo(
+        name=proc.name(),
+        command=command[:500],  # Limit command length
+        user=username,
+        created=create_time,
+    )
+
+
+def get_process_info(
+    proc: psutil.Process,
+    with_details: bool = True,
+    static_cache: Optional[StaticCache] = None,
+) -> Optional[ProcessModel]:
+    """Extract process information safely from psutil Process
+
+    With with_details=False the expensive fields (cwd, open files and
+    connections) are skipped and left at their defaults. With a
+    static_cache, command, user and creation time of known processes are
+    taken from the cache instead of being re-read.
+    """
     try:
         with proc.oneshot():
             mem_info = proc.memory_info()
             cpu_times = proc.cpu_times()
             
-            # Get command line
-            try:
-                cmdline = proc.cmdline()
-                command = ' '.join(cmdline) if cmdline else proc.name()
-            except (psutil.AccessDenied, psutil.ZombieProcess):
-                command = f"[{proc.name()}]"
-            
-            # Get working directory
-            try:
-                cwd = proc.cwd()
-            except (psutil.AccessDenied, psutil.ZombieProcess):
-                cwd = "N/A"
-            
-            # Get open files count
             try:
-                open_files = len(proc.open_files())
-            except (psutil.AccessDenied, psutil.ZombieProcess):
-                open_files = 0
+                start_time = proc.create_time()
+            except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                start_time = 0.0
             
-            # Get network connections count
-            try:
-                network_conns = len(proc.connections())
-            except (psutil.AccessDenied, psutil.ZombieProcess):
-                network_conns = 0
+            # Command line, user and creation time
+            static = None
+            if static_cache is not None:
+                key = (proc.pid, start_time)
+                static = static_cache.get(key, proc.name())
+            if static is None:
+                static = get_psutil_static(proc, start_time)
+                if static_cache is not None:
+                    static_cache.put(key, static)
             
-            # Get username
-            try:
-                username = proc.username()
-            except (psutil.AccessDenied, psutil.ZombieProcess):
-                username = "N/A"
+            details = get_psutil_details(proc) if with_details else ProcessDetails("N/A", 0, 0)
             
             # Get parent PID
             try:
@@ -89,12 +168,6 @@ def get_process_info(proc: psutil.Process) -> Optional[ProcessModel]:
             except (psutil.AccessDenied, psutil.ZombieProcess):
                 num_threads = 0
             
-            # Format creation time
-            try:
-                create_time = datetime.fromtimestamp(proc.create_time()).strftime('%Y-%m-%d %H:%M:%S')
-            except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
-                create_time = "N/A"
-            
             # Get priority/nice value
             try:
                 priority = proc.nice()
@@ -103,58 +176,230 @@ def get_process_info(proc: psutil.Process) -> Optional[ProcessModel]:
             
             return ProcessModel(
                 pid=proc.pid,
-                user=username,
+                user=static.user,
                 cpu=proc.cpu_percent(),
                 mem=proc.memory_percent(),
                 vsz=mem_info.vms,
                 rss=mem_info.rss,
                 status=proc.status(),
                 threads=num_threads,
-                command=command[:500],  # Limit command length
+                command=static.command,
                 ppid=ppid,
-                created=create_time,
+                created=static.created,
                 cpu_time_user=cpu_times.user,
                 cpu_time_sys=cpu_times.system,
-                cwd=cwd,
-                open_files=open_files,
-                network_conns=network_conns,
-                priority=priority
+                priority=priority,
+                name=static.name,
+                create_time=start_time,
+                cwd=details.cwd,
+                open_files=details.open_files,
+                network_conns=details.network_conns
             )
     except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
         return None
 
 
-def get_real_processes() -> List[ProcessModel]:
+_psutil_static_cache = StaticCache()
+
+
+def get_psutil_processes() -> List[ProcessModel]:
     """Get real process data from the system using psutil"""
     processes = []
     
     for proc in psutil.process_iter():
-        info = get_process_info(proc)
+        info = get_process_info(proc, with_details=False, static_cache=_psutil_static_cache)
         if info:
             processes.append(info)
     
+    _psutil_static_cache.retain({(p.pid, p.create_time) for p in processes})
     return processes
 
 
-def get_system_stats():
-    """Get overall system statistics"""
-    cpu_percent = psutil.cpu_percent(interval=0.1)
+_procfs_scanner = None
+_sharded_scanner = None
+
+# Sharded multi-process scanning: worker count (0 = automatic, 1 = never
+# shard) and the PID count at which scans switch over to the workers
+_scan_workers = int(os.environ.get("ELPM_SCAN_WORKERS", "0"))
+_shard_threshold = int(os.environ.get("ELPM_SHARD_THRESHOLD", "20000"))
+
+
+def configure_sharded_scan(workers: Optional[int] = None, threshold: Optional[int] = None):
+    """Set the scan worker count and the PID count that triggers sharding"""
+    global _scan_workers, _shard_threshold
+    if workers is not None:
+        _scan_workers = workers
+    if threshold is not None:
+        _shard_threshold = threshold
+    close_sharded_scanner()
+
+
+def close_sharded_scanner():
+    """Stop the sharded scan workers, if running"""
+    global _sharded_scanner
+    if _sharded_scanner is not None:
+        _sharded_scanner.close()
+        _sharded_scanner = None
+
+
+atexit.register(close_sharded_scanner)
+
+
+def get_local_processes() -> List[ProcessModel]:
+    """Scan processes in this interpreter, using the batched procfs scanner on Linux
+
+    Above the shard threshold the scan is split across persistent worker
+    processes; it drops back to a single scanner once the PID count falls
+    below 3/4 of the threshold, or if a worker dies.
+    """
+    global _procfs_scanner, _sharded_scanner, _scan_workers
+    from models import procfs, sharded_scan
+
+    if not procfs.is_available():
+        return get_psutil_processes()
+
+    pids = procfs.list_pids()
+    workers = _scan_workers or sharded_scan.default_workers()
+    if workers > 1:
+        if _sharded_scanner is None and len(pids) >= _shard_threshold:
+            _sharded_scanner = sharded_scan.ShardedScanner(workers)
+        elif _sharded_scanner is not None and len(pids) < _shard_threshold * 3 // 4:
+            close_sharded_scanner()
+
+    if _sharded_scanner is not None:
+        try:
+            return _sharded_scanner.scan(pids)
+        except (OSError, EOFError):
+            close_sharded_scanner()
+            _scan_workers = 1
+
+    if _procfs_scanner is None:
+        _procfs_scanner = procfs.ProcfsScanner()
+    return _procfs_scanner.scan(pids)
+
+
+_collector_process = None
+_out_of_process = os.environ.get("ELPM_COLLECTOR", "") == "process"
+
+
+def configure_collector(out_of_process: bool):
+    """Run process collection in a separate child process (or in-process)"""
+    global _out_of_process
+    _out_of_process = out_of_process
+    if not out_of_process:
+        close_collector_process()
+
+
+def close_collector_process():
+    """Stop the collector child process, if running"""
+    global _collector_process
+    if _collector_process is not None:
+        _collector_process.close()
+        _collector_process = None
+
+
+atexit.register(close_collector_process)
+
+
+def get_real_processes() -> List[ProcessModel]:
+    """Get real process data
+
+    In out-of-process mode the scan runs in a child process that publishes
+    it through shared memory; if the child fails, collection falls back to
+    scanning in this interpreter.
+    """
+    if _out_of_process:
+        return get_process_columns().to_models()
+    return get_local_processes()
+
+
+def get_process_columns():
+    """Get real process data as a ProcessColumns table
+
+    In out-of-process mode the table is taken straight from the child's
+    shared-memory ring, without building ProcessModel objects.
+    """
+    global _collector_process, _out_of_process
+    from models.columnar import ProcessColumns
+
+    if _out_of_process:
+        from models import shm_collector
+
+        try:
+            if _collector_process is None:
+                _collector_process = shm_collector.CollectorProcess()
+            return _collector_process.collect()
+        except (OSError, EOFError):
+            close_collector_process()
+            _out_of_process = False
+    return ProcessColumns.from_processes(get_local_processes())
+
+
+_cpu_sampler = None
+
+
+def get_cpu_stats(cpu_interval: Optional[float] = None):
+    """Get total and per-core CPU utilization plus iowait and steal
+
+    On Linux this reads /proc/stat once and never sleeps; elsewhere psutil
+    is used, blocking for cpu_interval unless it is None.
+    """
+    global _cpu_sampler
+    from models import procfs
+
+    if procfs.is_available():
+        if _cpu_sampler is None:
+            from models.cpu_sampler import CpuSampler
+            _cpu_sampler = CpuSampler()
+        sample = _cpu_sampler.sample()
+        return sample.percent, list(sample.per_core), sample.iowait, sample.steal
+
+    per_core = psutil.cpu_percent(interval=cpu_interval, percpu=True)
+    times = psutil.cpu_times_percent(interval=None)
+    cpu_percent = sum(per_core) / len(per_core) if per_core else 0.0
+    return cpu_percent, per_core, getattr(times, 'iowait', 0.0), getattr(times, 'steal', 0.0)
+
+
+def get_system_stats(cpu_interval: Optional[float] = 0.1):
+    """Get overall system statistics
+
+    cpu_interval=None measures CPU usage since the previous call instead of
+    blocking for the interval (always the case on Linux).
+    """
+    cpu_percent, cpu_per_core, cpu_iowait, cpu_steal = get_cpu_stats(cpu_interval)
     mem = psutil.virtual_memory()
     disk = psutil.disk_usage('/')
     
     return {
         'cpu_percent': cpu_percent,
+        'cpu_per_core': cpu_per_core,
+        'cpu_iowait': cpu_iowait,
+        'cpu_steal': cpu_steal,
         'mem_percent': mem.percent,
         'mem_used': mem.used,
         'mem_total': mem.total,
         'disk_percent': disk.percent,
         'disk_used': disk.used,
         'disk_total': disk.total,
+        'disk_io': psutil.disk_io_counters(),
+        'net_io': psutil.net_io_counters(),
     }
 
 
-def get_network_connections():
-    """Get all network connections"""
+def get_network_interfaces():
+    """Get per-interface network I/O counters"""
+    try:
+        return psutil.net_io_counters(pernic=True)
+    except (psutil.AccessDenied, OSError):
+        return {}
+
+
+def get_network_connections(names: Optional[Dict[int, str]] = None):
+    """Get all network connections
+
+    names maps PIDs to process names (e.g. from the current snapshot) so
+    connection owners do not have to be looked up one by one.
+    """
     connections = []
     
     try:
@@ -162,7 +407,9 @@ def get_network_connections():
             try:
                 # Get process name if PID exists
                 proc_name = "N/A"
-                if conn.pid:
+                if conn.pid and names is not None:
+                    proc_name = names.get(conn.pid, "N/A")
+                elif conn.pid:
                     try:
                         proc = psutil.Process(conn.pid)
                         proc_name = proc.name()
@@ -179,7 +426,8 @@ def get_network_connections():
                     'protocol': 'TCP' if conn.type == 1 else 'UDP',
                     'local': local_addr,
                     'remote': remote_addr,
-                    'status': conn.status
+                    'status': conn.status,
+                    'inode': 0
                 })
             except Exception:
                 continue
@@ -189,40 +437,102 @@ def get_network_connections():
     return connections
 
 
-def build_process_tree(processes: List[ProcessModel], max_depth: int = 10):
-    """Build a hierarchical process tree"""
-    # Create a dict for quick lookup
-    proc_dict = {p.pid: p for p in processes}
-    
-    # Find root processes (typically init/systemd with PID 1 or processes with PPID 0)
-    roots = [p for p in processes if p.ppid == 0 or p.pid == 1]
-    
-    def get_children(parent_pid, depth=0):
-        """Recursively get children of a process"""
-        if depth > max_depth:
-            return []
-        
-        children = []
-        for proc in processes:
-            if proc.ppid == parent_pid:
-                children.append({
-                    'process': proc,
-                    'children': get_children(proc.pid, depth + 1),
-                    'depth': depth
-                })
-        
-        # Sort by CPU usage
-        children.sort(key=lambda x: x['process'].cpu, reverse=True)
-        return children
-    
+def subtree_totals(proc: ProcessModel, children: List[Dict]) -> Dict:
+    """Roll a process's own usage up with its children's subtree totals"""
+    totals = {'cpu': proc.cpu, 'rss': proc.rss, 'threads': proc.threads, 'descendants': 0}
+    for child in children:
+        child_totals = child['totals']
+        totals['cpu'] += child_totals['cpu']
+        totals['rss'] += child_totals['rss']
+        totals['threads'] += child_totals['threads']
+        totals['descendants'] += child_totals['descendants'] + 1
+    return totals
+
+
+def parent_indexes(pids: Sequence[int], ppids: Sequence[int],
+                   namespaces: Optional[Dict[int, int]] = None) -> List[int]:
+    """Index of every process's parent in the same lists, -1 for roots
+
+    The one rule set every process tree is built with. Roots are the
+    processes whose parent is not in the lists (PID 1, kthreadd, orphans
+    whose parent has exited), that name themselves as parent, or whose
+    parent is in another PID namespace (namespaces maps PID -> namespace
+    id, see procfs.read_pid_namespaces), such as a container's init.
+    Parent links that loop are cut at the lowest PID of the loop.
+    """
+    by_pid = {pid: index for index, pid in enumerate(pids)}
+    namespaces = namespaces or {}
+    parents = []
+    for index, (pid, ppid) in enumerate(zip(pids, ppids)):
+        parent = by_pid.get(ppid, -1)
+        if parent == index or (pid in namespaces and ppid in namespaces
+                               and namespaces[pid] != namespaces[ppid]):
+            parent = -1
+        parents.append(parent)
+
+    # Walk every chain once; a chain that reaches a node of itself is a loop
+    state = [0] * len(parents)  # 1: on the current chain, 2: done
+    for start in range(len(parents)):
+        chain = []
+        index = start
+        while index >= 0 and not state[index]:
+            state[index] = 1
+            chain.append(index)
+            index = parents[index]
+        if index >= 0 and state[index] == 1:
+            loop = chain[chain.index(index):]
+            parents[min(loop, key=pids.__getitem__)] = -1
+        for index in chain:
+            state[index] = 2
+    return parents
+
+
+def build_process_tree(processes: List[ProcessModel], max_depth: Optional[int] = None,
+                       namespaces: Optional[Dict[int, int]] = None):
+    """Build a hierarchical process tree in O(n) (plus sorting the siblings)
+
+    Roots and loop cuts follow parent_indexes(): orphans, processes whose
+    parent is in another PID namespace (with namespaces, PID -> PID
+    namespace id) and the lowest PID of a parent loop start their own
+    trees. Nodes at max_depth (if given) keep their subtree totals but list
+    no children and are marked 'truncated'.
+
+    Every node carries 'totals' for its whole subtree (cpu, rss, threads,
+    descendants), summed bottom-up.
+    """
+    parents = parent_indexes([p.pid for p in processes], [p.ppid for p in processes], namespaces)
+
+    # parent -> children index; every process has one parent or is a root
+    children_of: Dict[int, List[int]] = {}
+    roots = []
+    for index, parent in enumerate(parents):
+        if parent < 0:
+            roots.append(index)
+        else:
+            children_of.setdefault(parent, []).append(index)
+
     tree = []
-    for root in roots:
-        tree.append({
-            'process': root,
-            'children': get_children(root.pid),
-            'depth': 0
-        })
-    
+    order = []  # Every node, parents before children
+    # Iterative, so deep chains cannot overflow
+    stack = [(root, 0, tree) for root in reversed(roots)]
+    while stack:
+        index, depth, siblings = stack.pop()
+        node = {'process': processes[index], 'children': [], 'depth': depth, 'truncated': False}
+        siblings.append(node)
+        order.append(node)
+        for child in children_of.get(index, ()):
+            stack.append((child, depth + 1, node['children']))
+
+    # Children come after their parents in order, so reversed it is bottom-up
+    for node in reversed(order):
+        children = node['children']
+        node['totals'] = subtree_totals(node['process'], children)
+        # Heaviest subtrees first
+        children.sort(key=lambda x: x['totals']['cpu'], reverse=True)
+        if max_depth is not None and node['depth'] >= max_depth and children:
+            node['children'] = []
+            node['truncated'] = True
+
     return tree
 
 
@@ -0,0 +1,279 @@
+"""
+Batched procfs scanner - reads /proc/[pid]/stat, statm and status for every
+PID in one pass and builds ProcessModel objects without per-process psutil calls.
+The cmdline and status files are only read for processes not yet in the
+static-attribute cache.
+"""
+
+import os
+import pwd
+import re
+import stat
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models.process_model import ProcessDetails, ProcessModel
+from models.static_cache import StaticCache, StaticInfo
+
+PROC_ROOT = "/proc"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Same status names psutil reports, keyed by the state byte in /proc/[pid]/stat
+STATUS_NAMES = {
+    ord("R"): "running",
+    ord("S"): "sleeping",
+    ord("D"): "disk-sleep",
+    ord("T"): "stopped",
+    ord("t"): "tracing-stop",
+    ord("Z"): "zombie",
+    ord("X"): "dead",
+    ord("x"): "dead",
+    ord("K"): "wake-kill",
+    ord("W"): "waking",
+    ord("P"): "parked",
+    ord("I"): "idle",
+}
+
+# Precompiled byte-level parsers
+UID_RE = re.compile(rb"^Uid:\s+(\d+)", re.MULTILINE)
+MEMTOTAL_RE = re.compile(rb"^MemTotal:\s+(\d+)", re.MULTILINE)
+
+
+def is_available(proc_root: str = PROC_ROOT) -> bool:
+    """Return True when a Linux procfs is mounted at proc_root"""
+    return os.path.exists(os.path.join(proc_root, "self", "stat"))
+
+
+def read_file(path: str, size: int = 4096) -> bytes:
+    """Read up to size bytes from a (proc) file with a single read call"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def read_boot_time(proc_root: str = PROC_ROOT) -> float:
+    """Read system boot time (epoch seconds) from /proc/stat
+
+    btime follows the per-CPU and interrupt lines, which can take up far
+    more than one read on hosts with many CPUs or IRQs, so the file is read
+    line by line until it. Raises RuntimeError if there is no btime line:
+    a wrong boot time would skew every process creation time.
+    """
+    with open(f"{proc_root}/stat", "rb") as f:
+        for line in f:
+            if line.startswith(b"btime "):
+                return float(line.split()[1])
+    raise RuntimeError(f"no btime line in {proc_root}/stat")
+
+
+def read_mem_total(proc_root: str = PROC_ROOT) -> int:
+    """Read total physical memory in bytes from /proc/meminfo"""
+    match = MEMTOTAL_RE.search(read_file(f"{proc_root}/meminfo"))
+    return int(match.group(1)) * 1024 if match else 0
+
+
+def list_pids(proc_root: str = PROC_ROOT) -> List[int]:
+    """List all PIDs currently present in procfs"""
+    return [int(name) for name in os.listdir(proc_root) if name.isdigit()]
+
+
+def read_pid_namespaces(pids: Iterable[int], proc_root: str = PROC_ROOT) -> Dict[int, int]:
+    """Map PIDs to the inode of their PID namespace (from /proc/[pid]/ns/pid)
+
+    PIDs whose namespace cannot be read (exited, or not ours without
+    privileges) are left out.
+    """
+    namespaces = {}
+    for pid in pids:
+        try:
+            link = os.readlink(f"{proc_root}/{pid}/ns/pid")
+        except OSError:
+            continue
+        # "pid:[4026531836]"
+        namespaces[pid] = int(link[link.index("[") + 1:-1])
+    return namespaces
+
+
+def parse_stat(data: bytes) -> Tuple[bytes, List[bytes]]:
+    """Split /proc/[pid]/stat into (comm, fields after comm).
+
+    The comm field may itself contain spaces and parentheses, so it is
+    delimited by the first '(' and the last ')'.
+    """
+    start = data.index(b"(")
+    end = data.rindex(b")")
+    return data[start + 1:end], data[end + 2:].split()
+
+
+class ProcfsScanner:
+    """Stateful /proc scanner producing ProcessModel objects.
+
+    The scanner keeps the previous CPU time of every process, keyed by
+    (pid, start time), so CPU% is computed from deltas between scans just
+    like psutil's cpu_percent().
+    """
+
+    def __init__(self, proc_root: str = PROC_ROOT, static_cache: Optional[StaticCache] = None):
+        self.proc_root = proc_root
+        self.boot_time = read_boot_time(proc_root)
+        self.mem_total = read_mem_total(proc_root)
+        self.usernames: Dict[int, str] = {}
+        self.static_cache = static_cache if static_cache is not None else StaticCache()
+        self.prev_cpu: Dict[Tuple[int, int], int] = {}
+        self.prev_time: Optional[float] = None
+
+    def scan(self, pids: Optional[List[int]] = None) -> List[ProcessModel]:
+        """Scan the given PIDs (all PIDs by default) in one pass"""
+        if pids is None:
+            pids = list_pids(self.proc_root)
+
+        now = time.monotonic()
+        elapsed = now - self.prev_time if self.prev_time is not None else 0.0
+        prev_cpu = self.prev_cpu
+        cpu_totals = {}
+
+        processes = []
+        for pid in pids:
+            info = self.read_process(pid, elapsed, prev_cpu, cpu_totals)
+            if info:
+                processes.append(info)
+
+        self.prev_cpu = cpu_totals
+        self.prev_time = now
+        self.static_cache.retain(cpu_totals.keys())
+        return processes
+
+    def read_process(self, pid, elapsed, prev_cpu, cpu_totals) -> Optional[ProcessModel]:
+        """Read a single process; returns None if it vanished meanwhile"""
+        base = f"{self.proc_root}/{pid}"
+        try:
+            comm, fields = parse_stat(read_file(f"{base}/stat"))
+            statm = read_file(f"{base}/statm").split()
+        except (OSError, ValueError, IndexError):
+            return None
+
+        utime = int(fields[11])
+        stime = int(fields[12])
+        start_ticks = int(fields[19])
+
+        # CPU% from the delta against the previous scan
+        key = (pid, start_ticks)
+        total = utime + stime
+        cpu_totals[key] = total
+        prev = prev_cpu.get(key)
+        if prev is not None and elapsed > 0:
+            cpu = (total - prev) / CLOCK_TICKS / elapsed * 100
+        else:
+            cpu = 0.0
+
+        rss = int(statm[1]) * PAGE_SIZE
+        name = comm.decode("utf-8", "replace")
+        start_time = self.boot_time + start_ticks / CLOCK_TICKS
+
+        # Known processes skip the cmdline / status reads entirely
+        static = self.static_cache.get(key, name)
+        if static is None:
+            static = self.read_static(base, name, start_time)
+            if static is None:
+                return None
+            self.static_cache.put(key, static)
+
+        return ProcessModel(
+            pid=pid,
+            user=static.user,
+            cpu=cpu,
+            mem=rss / self.mem_total * 100 if self.mem_total else 0.0,
+            vsz=int(statm[0]) * PAGE_SIZE,
+            rss=rss,
+            status=STATUS_NAMES.get(fields[0][0], "?"),
+            threads=int(fields[17]),
+            command=static.command,
+            ppid=int(fields[1]),
+            created=static.created,
+            cpu_time_user=utime / CLOCK_TICKS,
+            cpu_time_sys=stime / CLOCK_TICKS,
+            priority=int(fields[16]),
+            name=name,
+            create_time=start_time,
+        )
+
+    def read_static(self, base: str, name: str, start_time: float) -> Optional[StaticInfo]:
+        """Read the attributes that stay fixed for the lifetime of a process"""
+        # Command line
+        try:
+            cmdline = read_file(f"{base}/cmdline").rstrip(b"\0")
+            command = cmdline.replace(b"\0", b" ").decode("utf-8", "replace") if cmdline else name
+        except PermissionError:
+            command = f"[{name}]"
+        except OSError:
+            return None
+
+        try:
+            status = read_file(f"{base}/status")
+        except OSError:
+            return None
+        uid_match = UID_RE.search(status)
+        username = self.get_username(int(uid_match.group(1))) if uid_match else "N/A"
+
+        return StaticInfo(
+            name=name,
+            command=command[:500],  # Limit command length
+            user=username,
+            created=datetime.fromtimestamp(start_time).strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+    def get_username(self, uid: int) -> str:
+        """Resolve a UID to a user name, caching the result"""
+        name = self.usernames.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self.usernames[uid] = name
+        return name
+
+
+def read_process_details(pid: int, proc_root: str = PROC_ROOT) -> Optional[ProcessDetails]:
+    """Read cwd and count file / network descriptors of one process.
+
+    Open files are descriptors pointing at regular files; network
+    connections are the process's sockets found in the inet (TCP/UDP)
+    tables, as psutil counts them, so unix and netlink sockets are left out.
+    Returns None if the process no longer exists.
+    """
+    base = f"{proc_root}/{pid}"
+    try:
+        cwd = os.readlink(f"{base}/cwd")
+    except FileNotFoundError:
+        return None
+    except OSError:
+        return ProcessDetails(cwd="N/A", open_files=0, network_conns=0)
+
+    open_files = 0
+    sockets = set()
+    fd_dir = f"{base}/fd"
+    try:
+        for fd in os.listdir(fd_dir):
+            path = f"{fd_dir}/{fd}"
+            try:
+                target = os.readlink(path)
+                if target.startswith("socket:["):
+                    sockets.add(int(target[8:-1]))
+                elif target.startswith("/") and stat.S_ISREG(os.stat(path).st_mode):
+                    open_files += 1
+            except (OSError, ValueError):
+                continue
+    except OSError:
+        pass
+
+    network_conns = 0
+    if sockets:
+        from models.sockets import read_socket_tables
+
+        network_conns = sum(1 for entry in read_socket_tables(proc_root) if entry.inode in sockets)
+    return ProcessDetails(cwd=cwd, open_files=open_files, network_conns=network_conns)
@@ -0,0 +1,531 @@
+"""
+Process query engine - compiles filter expressions such as
+
+    cpu>20 user=postgres cmd~"gunicorn.*worker" rss>1G
+
+into vectorized mask and argsort operations over a columnar snapshot.
+
+Terms are separated by whitespace and must all match. A term is either
+"field<op>value" or a bare word / quoted phrase, which matches processes
+whose command, user or PID contains it (case-insensitive).
+
+    Numeric fields: pid, ppid, cpu, mem, rss, vsz, threads, prio (priority)
+        operators: = != > >= < <=; rss and vsz accept K/M/G/T suffixes
+    Text fields:    user, cmd (command), name, status (state)
+        operators: = != (exact), ~ !~ (case-insensitive regex search)
+
+String predicates are evaluated once per distinct string a field uses
+and then broadcast to the rows through the codes. Bare words search a
+per-snapshot lower-cased haystack of those strings in one pass; regexes
+still run per string (about 1 µs each, so tens of milliseconds at 50k
+distinct command lines).
+Every predicate can also be evaluated on a subset of rows, which is how
+a query that narrows the previous one only rescans the previous result.
+"""
+
+import re
+import shlex
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.columnar import ProcessColumns
+from models.process_model import parent_indexes
+
+
+class QueryError(ValueError):
+    """Raised for filter expressions that cannot be parsed"""
+
+
+NUMERIC_ALIASES = {
+    "pid": "pid",
+    "ppid": "ppid",
+    "cpu": "cpu",
+    "mem": "mem",
+    "rss": "rss",
+    "vsz": "vsz",
+    "threads": "threads",
+    "prio": "priority",
+    "priority": "priority",
+}
+STRING_ALIASES = {
+    "user": "user",
+    "cmd": "command",
+    "command": "command",
+    "name": "name",
+    "status": "status",
+    "state": "status",
+}
+FIELD_NAMES = set(NUMERIC_ALIASES) | set(STRING_ALIASES)
+SIZE_FIELDS = ("rss", "vsz")
+SIZE_SUFFIXES = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+OPERATORS = ("!=", ">=", "<=", "!~", "==", "=", ">", "<", "~")
+TERM_RE = re.compile(r"^([A-Za-z_]+)(!=|>=|<=|!~|==|=|>|<|~)(.*)$", re.DOTALL)
+SIZE_RE = re.compile(r"^([0-9]*\.?[0-9]+)\s*([KMGT]?)(?:I?B)?$", re.IGNORECASE)
+
+NUMERIC_OPS: Dict[str, Callable] = {
+    "=": np.equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+# Sort keys, primary first: ((field, descending), ...)
+SortSpec = Sequence[Tuple[str, bool]]
+
+# Cached per-snapshot derivations
+LOWER_STRINGS = "lower_strings"
+PARENT_POSITIONS = "parent_positions"
+
+# Haystack entries are joined with a character search text never contains;
+# above one hit per HAYSTACK_HIT_SHARE strings, testing each string is cheaper
+HAYSTACK_SEPARATOR = "\0"
+HAYSTACK_HIT_SHARE = 4
+
+
+def lower_strings(columns: ProcessColumns) -> List[str]:
+    """Lower-cased copy of the snapshot's string table (cached)"""
+    return columns.derive(LOWER_STRINGS, lambda: [text.lower() for text in columns.strings])
+
+
+def column_values(columns: ProcessColumns, field: str, rows: Optional[np.ndarray]) -> np.ndarray:
+    """A column, restricted to rows unless rows is None"""
+    values = columns.column(field)
+    return values if rows is None else values[rows]
+
+
+def field_codes(columns: ProcessColumns, fields: Sequence[str],
+                rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Distinct string codes the fields use, over all rows (cached per snapshot) or only rows"""
+    def used():
+        seen = np.zeros(len(columns.strings), dtype=bool)
+        for field in fields:
+            seen[column_values(columns, field, rows)] = True
+        return np.flatnonzero(seen)
+    return used() if rows is not None else columns.derive(("codes",) + tuple(fields), used)
+
+
+def table_mask(columns: ProcessColumns, fields: Sequence[str], test: Callable[[str], bool],
+               strings: Optional[Sequence[str]] = None,
+               rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rows where any of the fields passes test, testing each distinct string once.
+
+    Only strings the fields reference are tested (with rows given, only
+    those the rows reference), so other columns' strings cost nothing.
+    """
+    strings = columns.strings if strings is None else strings
+    used = field_codes(columns, fields, rows)
+    matches = np.zeros(len(strings), dtype=bool)
+    matches[used] = np.fromiter((test(strings[code]) for code in used.tolist()), dtype=bool, count=len(used))
+    return string_rows(columns, fields, matches, rows)
+
+
+def string_rows(columns: ProcessColumns, fields: Sequence[str], matches: np.ndarray,
+                rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rows where any of the fields holds a string marked in matches (one flag per code)"""
+    mask = np.zeros(len(columns) if rows is None else len(rows), dtype=bool)
+    for field in fields:
+        mask |= matches[column_values(columns, field, rows)]
+    return mask
+
+
+def haystack(columns: ProcessColumns, fields: Sequence[str]) -> Tuple[str, np.ndarray, np.ndarray]:
+    """The strings the fields use, lower-cased and joined into one text (cached per snapshot)
+
+    Returns (text, starts, codes): string codes[i] begins at offset
+    starts[i] of text. The strings are lower-cased as one text unless that
+    changes a length (a few characters lower-case to two).
+    """
+    def build():
+        codes = field_codes(columns, fields)
+        entries = [columns.strings[code] for code in codes.tolist()]
+        joined = HAYSTACK_SEPARATOR.join(entries)
+        text = joined.lower()
+        if len(text) != len(joined):
+            entries = [entry.lower() for entry in entries]
+            text = HAYSTACK_SEPARATOR.join(entries)
+        starts = np.zeros(len(entries), dtype=np.int64)
+        lengths = np.fromiter(map(len, entries), dtype=np.int64, count=len(entries))
+        np.cumsum(lengths[:-1] + len(HAYSTACK_SEPARATOR), out=starts[1:])
+        return text, starts, codes
+    return columns.derive(("haystack",) + tuple(fields), build)
+
+
+def contains_mask(columns: ProcessColumns, fields: Sequence[str], needle: str,
+                  rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rows where any of the fields contains needle, ignoring case
+
+    The snapshot's haystack is searched in one pass and every hit is mapped
+    back to its string. Needles found in a large share of the strings, and
+    narrowed searches over few rows, test the strings one by one instead,
+    which is cheaper there.
+    """
+    needle = needle.lower()
+    if needle and HAYSTACK_SEPARATOR not in needle:
+        text, starts, codes = haystack(columns, fields)
+        budget = len(codes) // HAYSTACK_HIT_SHARE
+        if rows is None or len(rows) >= budget:
+            hits = []
+            find = text.find
+            at = find(needle)
+            while at >= 0 and len(hits) <= budget:
+                hits.append(at)
+                at = find(needle, at + len(needle))
+            if at < 0:
+                matches = np.zeros(len(columns.strings), dtype=bool)
+                matches[codes[np.searchsorted(starts, hits, side="right") - 1]] = True
+                return string_rows(columns, fields, matches, rows)
+    return table_mask(columns, fields, lambda text: needle in text, lower_strings(columns), rows)
+
+
+def parse_number(field: str, text: str) -> float:
+    """Parse a numeric filter value, allowing size suffixes on byte fields"""
+    text = text.strip().rstrip("%")
+    if field in SIZE_FIELDS:
+        match = SIZE_RE.match(text)
+        if match:
+            return float(match.group(1)) * SIZE_SUFFIXES[match.group(2).upper()]
+    try:
+        return float(text)
+    except ValueError:
+        raise QueryError(f"'{text}' is not a valid number for {field}") from None
+
+
+@dataclass(frozen=True)
+class NumericPredicate:
+    """field <op> number"""
+    field: str
+    op: str
+    value: float
+
+    def mask(self, columns: ProcessColumns, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        return NUMERIC_OPS[self.op](column_values(columns, self.field, rows), self.value)
+
+    def implies(self, other) -> bool:
+        """True if every row matching self also matches other"""
+        if self == other:
+            return True
+        if not isinstance(other, NumericPredicate) or other.field != self.field:
+            return False
+        if self.op in (">", ">=") and other.op in (">", ">="):
+            return self.value > other.value or (self.value == other.value and other.op == ">=")
+        if self.op in ("<", "<=") and other.op in ("<", "<="):
+            return self.value < other.value or (self.value == other.value and other.op == "<=")
+        return False
+
+
+@dataclass(frozen=True)
+class StringPredicate:
+    """field = text, field != text, field ~ regex or field !~ regex"""
+    field: str
+    op: str
+    value: str
+
+    def mask(self, columns: ProcessColumns, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        if self.op in ("~", "!~"):
+            search = re.compile(self.value, re.IGNORECASE).search
+            mask = table_mask(columns, (self.field,), lambda text: search(text) is not None, rows=rows)
+        else:
+            code = columns.string_codes.get(self.value)
+            values = column_values(columns, self.field, rows)
+            mask = values == code if code is not None else np.zeros(len(values), dtype=bool)
+        return ~mask if self.op.startswith("!") else mask
+
+    def implies(self, other) -> bool:
+        """True if every row matching self also matches other"""
+        return self == other
+
+
+@dataclass(frozen=True)
+class TextPredicate:
+    """Bare word: command, user or PID contains the text (case-insensitive)"""
+    text: str
+
+    def mask(self, columns: ProcessColumns, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        needle = self.text.lower()
+        mask = contains_mask(columns, ("command", "user"), needle, rows)
+        if is_pid_text(needle):
+            mask |= pid_contains(column_values(columns, "pid", rows), needle)
+        return mask
+
+    def implies(self, other) -> bool:
+        """True if every row matching self also matches other.
+
+        A longer needle containing the other one can only match fewer rows.
+        """
+        return isinstance(other, TextPredicate) and other.text.lower() in self.text.lower()
+
+
+# PIDs fit in int32, so no PID has more digits than this
+MAX_PID_DIGITS = 10
+
+
+def is_pid_text(text: str) -> bool:
+    """True if text can be part of a PID (ASCII digits only; "²".isdigit() is True too)"""
+    return text.isascii() and text.isdigit()
+
+
+def pid_contains(pids: np.ndarray, digits: str) -> np.ndarray:
+    """Vectorized str(pid) substring test: compare every window of len(digits) digits"""
+    if not is_pid_text(digits) or len(digits) > MAX_PID_DIGITS:
+        return np.zeros(len(pids), dtype=bool)
+    width = 10 ** len(digits)
+    value = int(digits)
+    # PID 0 is the one number whose leading digit is 0
+    mask = pids == 0 if digits == "0" else np.zeros(len(pids), dtype=bool)
+    shifted = pids.astype(np.int64)
+    # A window only counts if the PID has enough digits left to fill it
+    while True:
+        full = shifted >= width // 10
+        if not full.any():
+            return mask
+        mask |= full & (shifted % width == value)
+        shifted = shifted // 10
+
+
+@dataclass(frozen=True)
+class KernelThreadPredicate:
+    """Matches kernel threads: kthreadd (PID 2) and its children"""
+
+    def mask(self, columns: ProcessColumns, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        return (column_values(columns, "pid", rows) == 2) | (column_values(columns, "ppid", rows) == 2)
+
+    def implies(self, other) -> bool:
+        return self == other
+
+
+@dataclass(frozen=True)
+class NotPredicate:
+    """Negation of another predicate"""
+    predicate: object
+
+    def mask(self, columns: ProcessColumns, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        return ~self.predicate.mask(columns, rows)
+
+    def implies(self, other) -> bool:
+        return self == other
+
+
+def tokenize(text: str) -> List[str]:
+    """Split an expression into terms, honouring quotes and spaced operators
+
+    Text with an unbalanced quote (e.g. "don't") is split on whitespace
+    only, so any literal search text still works.
+    """
+    try:
+        tokens = shlex.split(text)
+    except ValueError:
+        tokens = text.split()
+
+    # Join "cpu > 20", "cpu >20" and "cpu> 20" into a single term
+    terms: List[str] = []
+    for token in tokens:
+        if terms:
+            last = terms[-1]
+            if last.lower() in FIELD_NAMES and token.startswith(OPERATORS):
+                terms[-1] += token
+                continue
+            if last.endswith(OPERATORS) and TERM_RE.match(last):
+                terms[-1] += token
+                continue
+        terms.append(token)
+    return terms
+
+
+def parse_term(term: str):
+    """Compile one term into a predicate"""
+    match = TERM_RE.match(term)
+    if match is None:
+        return TextPredicate(term)
+
+    name, op, value = match.groups()
+    key = name.lower()
+    if key in NUMERIC_ALIASES:
+        field = NUMERIC_ALIASES[key]
+        if op not in NUMERIC_OPS:
+            raise QueryError(f"operator '{op}' is not supported for {name}")
+        if value == "":
+            raise QueryError(f"missing value for {name}{op}")
+        return NumericPredicate(field, op, parse_number(field, value))
+    if key in STRING_ALIASES:
+        if op not in ("=", "==", "!=", "~", "!~"):
+            raise QueryError(f"operator '{op}' is not supported for {name}")
+        if op in ("~", "!~"):
+            try:
+                re.compile(value, re.IGNORECASE)
+            except re.error as e:
+                raise QueryError(f"invalid regular expression '{value}': {e}") from None
+        return StringPredicate(STRING_ALIASES[key], "=" if op == "==" else op, value)
+    # Not a known field: treat the whole term as search text
+    return TextPredicate(term)
+
+
+class Query:
+    """Conjunction of compiled predicates"""
+
+    def __init__(self, predicates: Sequence = ()):
+        self.predicates = tuple(predicates)
+
+    @classmethod
+    def parse(cls, text: str) -> "Query":
+        """Compile a filter expression; raises QueryError on syntax errors"""
+        return cls(parse_term(term) for term in tokenize(text))
+
+    def extended(self, *predicates) -> "Query":
+        """Return a query with additional predicates"""
+        return Query(self.predicates + predicates)
+
+    def mask(self, columns: ProcessColumns, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Boolean mask of the rows (all, or the given positions) matching every predicate"""
+        mask = np.ones(len(columns) if rows is None else len(rows), dtype=bool)
+        for predicate in self.predicates:
+            if not mask.any():
+                break
+            mask &= predicate.mask(columns, rows)
+        return mask
+
+    def narrows(self, previous: "Query") -> bool:
+        """True if this query can only match a subset of what previous matched"""
+        return all(
+            any(predicate.implies(old) for predicate in self.predicates)
+            for old in previous.predicates
+        )
+
+    def filter(self, columns: ProcessColumns, within: Optional[np.ndarray] = None) -> np.ndarray:
+        """Positions of matching rows in snapshot order, searching only within if given"""
+        if within is None:
+            return np.flatnonzero(self.mask(columns))
+        return within[self.mask(columns, within)]
+
+    def run(self, columns: ProcessColumns, sort: Optional[SortSpec] = None,
+            limit: Optional[int] = None) -> np.ndarray:
+        """Return the positions of matching rows, ordered by sort (at most limit rows)"""
+        return sort_rows(columns, self.filter(columns), sort, limit)
+
+
+class IncrementalSearch:
+    """Runs successive queries over snapshots, narrowing where possible.
+
+    When a query narrows the previous one (e.g. the user typed another
+    character) on the same snapshot, only the previous result set is
+    rescanned instead of the whole table.
+    """
+
+    def __init__(self):
+        self.columns = None
+        self.query = None
+        self.rows = None
+        self.narrowed = False  # Whether the last run reused the previous result
+
+    def run(self, columns: ProcessColumns, query: Query,
+            sort: Optional[SortSpec] = None, limit: Optional[int] = None) -> np.ndarray:
+        """Return the positions of rows matching query, ordered by sort (at most limit rows)"""
+        self.narrowed = (
+            columns is self.columns
+            and self.query is not None
+            and query.narrows(self.query)
+        )
+        if self.narrowed and query.predicates == self.query.predicates:
+            rows = self.rows  # Same query on the same snapshot: only the sort or limit changed
+        else:
+            rows = query.filter(columns, self.rows if self.narrowed else None)
+        self.columns = columns
+        self.query = query
+        self.rows = rows
+        return sort_rows(columns, rows, sort, limit)
+
+    def reset(self):
+        """Forget the previous result"""
+        self.columns = self.query = self.rows = None
+
+
+def sort_rows(columns: ProcessColumns, rows: np.ndarray,
+              sort: Optional[SortSpec], limit: Optional[int] = None) -> np.ndarray:
+    """Order row positions by sort, or keep them as they are; keep at most limit rows
+
+    When only the first limit rows are wanted, the rows that can make the
+    cut are selected with a partial sort on the primary key and only those
+    are fully sorted.
+    """
+    if sort:
+        if limit is not None and limit < len(rows):
+            primary = sort_keys(columns, *sort[0])[rows]
+            # Every row tied with the limit-th key is kept so ties still
+            # resolve by the secondary keys and snapshot order
+            cutoff = np.partition(primary, limit - 1)[limit - 1]
+            rows = rows[primary <= cutoff]
+        rows = rows[sort_order(columns, rows, sort)]
+    return rows if limit is None else rows[:limit]
+
+
+def sort_keys(columns: ProcessColumns, field: str, descending: bool = False) -> np.ndarray:
+    """Ascending key array for a field (cached per snapshot)
+
+    Text fields sort case-insensitively; descending keys are negated so
+    every sort can run ascending and stay stable.
+    """
+    def keys():
+        if field in STRING_ALIASES.values():
+            table = columns.derive(("rank", field), lambda: string_ranks(columns, field))
+            values = table[columns.column(field)] if len(table) else np.zeros(len(columns), np.int64)
+        else:
+            values = columns.column(field)
+        return -values.astype(np.float64) if descending else values
+    return columns.derive(("sort", field, descending), keys)
+
+
+def string_ranks(columns: ProcessColumns, field: str) -> np.ndarray:
+    """Case-insensitive rank of every string the field uses, by string code
+
+    Only the field's own strings are sorted; other entries are left 0.
+    """
+    lowered = lower_strings(columns)
+    codes = field_codes(columns, (field,)).tolist()
+    codes.sort(key=lowered.__getitem__)
+    table = np.zeros(len(lowered), dtype=np.int64)
+    table[codes] = np.arange(len(codes))
+    return table
+
+
+def sort_order(columns: ProcessColumns, rows: np.ndarray, sort: SortSpec) -> np.ndarray:
+    """Stable argsort of rows by several (field, descending) keys, the first one primary
+
+    Ties on every key keep their snapshot order.
+    """
+    keys = [sort_keys(columns, field, descending)[rows] for field, descending in sort]
+    if len(keys) == 1:
+        return np.argsort(keys[0], kind="stable")
+    # lexsort sorts by its last key first
+    return np.lexsort(keys[::-1])
+
+
+def parent_positions(columns: ProcessColumns, namespaces: Optional[Dict[int, int]] = None) -> np.ndarray:
+    """Row of every row's parent in the process tree, -1 for roots (cached per snapshot)
+
+    Follows parent_indexes(), so namespaces should be the snapshot's own.
+    """
+    return columns.derive(PARENT_POSITIONS, lambda: np.array(parent_indexes(
+        columns.column("pid").tolist(), columns.column("ppid").tolist(), namespaces
+    ), dtype=np.intp))
+
+
+def with_ancestors(columns: ProcessColumns, mask: np.ndarray,
+                   namespaces: Optional[Dict[int, int]] = None) -> np.ndarray:
+    """mask plus the ancestor chain of every marked row
+
+    Chains are climbed only up to the first row already marked, so each row
+    is visited once however many matches share it.
+    """
+    parents = parent_positions(columns, namespaces).tolist()
+    keep = mask.tolist()
+    for row in np.flatnonzero(mask).tolist():
+        parent = parents[row]
+        while parent >= 0 and not keep[parent]:
+            keep[parent] = True
+            parent = parents[parent]
+    return np.array(keep, dtype=bool)
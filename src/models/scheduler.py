@@ -0,0 +1,58 @@
+"""
+Cost-adaptive refresh scheduling - stretches the refresh interval when
+collecting and rendering a snapshot would exceed a CPU budget, and shrinks
+it back to the base interval once ticks get cheap again
+"""
+
+
+class AdaptiveInterval:
+    """Refresh interval that keeps the per-tick cost within a budget.
+
+    budget is the fraction of one core the monitor may spend (0.02 = 2%).
+    A tick costing c seconds needs an interval of at least c / budget; the
+    cost is smoothed with an exponential moving average so a single slow
+    tick does not double the interval. The interval grows at once when the
+    budget is exceeded but shrinks by at most a quarter per tick, so it
+    does not oscillate.
+    """
+
+    def __init__(self, base: int = 2000, budget: float = 0.02,
+                 max_interval: int = 30000, smoothing: float = 0.3):
+        self.base = base
+        self.budget = budget
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        self.cost = None  # Smoothed seconds per tick
+        self.interval = base
+
+    def set_base(self, base: int) -> int:
+        """Change the base (minimum) interval in milliseconds"""
+        self.base = base
+        self.interval = max(self.interval, base)
+        return self.update()
+
+    def record(self, cost: float) -> int:
+        """Record the cost of one tick (seconds) and return the new interval (ms)"""
+        if self.cost is None:
+            self.cost = cost
+        else:
+            self.cost += self.smoothing * (cost - self.cost)
+        return self.update()
+
+    def update(self) -> int:
+        """Recompute the interval from the smoothed cost"""
+        needed = self.base
+        if self.cost is not None and self.budget > 0:
+            needed = max(needed, int(self.cost / self.budget * 1000))
+        needed = min(needed, max(self.max_interval, self.base))
+
+        if needed < self.interval:
+            needed = max(needed, int(self.interval * 0.75))
+        self.interval = needed
+        return needed
+
+    def load(self) -> float:
+        """Fraction of one core currently spent on refreshing"""
+        if self.cost is None or not self.interval:
+            return 0.0
+        return self.cost / (self.interval / 1000)
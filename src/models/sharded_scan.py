@@ -0,0 +1,104 @@
+"""
+Sharded procfs scanner - splits a /proc scan across persistent worker
+processes for hosts with tens of thousands of PIDs.
+
+PIDs are sharded by pid % workers, so a process always lands on the same
+worker and that worker's ProcfsScanner keeps the CPU-delta state and the
+static-attribute cache for it between scans.
+"""
+
+import multiprocessing
+import os
+from typing import List, Optional
+
+from models.process_model import ProcessModel
+from models.procfs import PROC_ROOT, ProcfsScanner, list_pids
+
+# Switch to sharded scanning at this many PIDs, and back below 3/4 of it
+DEFAULT_THRESHOLD = 20000
+DEFAULT_MAX_WORKERS = 4
+
+
+def default_workers() -> int:
+    """Number of scan workers to use when none is configured"""
+    return max(1, min(DEFAULT_MAX_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+def run_worker(conn, proc_root: str):
+    """Worker loop: scan each received PID shard until None arrives"""
+    scanner = ProcfsScanner(proc_root)
+    while True:
+        try:
+            pids = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if pids is None:
+            break
+        # Plain tuples pickle much faster than dataclass instances
+        conn.send([tuple(p.__dict__.values()) for p in scanner.scan(pids)])
+    conn.close()
+
+
+class ShardedScanner:
+    """ProcfsScanner-compatible scanner backed by persistent worker processes.
+
+    Workers are started with the "spawn" method so they never inherit the
+    Qt threads of the GUI process.
+    """
+
+    def __init__(self, workers: int, proc_root: str = PROC_ROOT):
+        self.proc_root = proc_root
+        self.connections = []
+        self.workers = []
+
+        context = multiprocessing.get_context("spawn")
+        for index in range(workers):
+            parent_conn, child_conn = context.Pipe()
+            worker = context.Process(
+                target=run_worker,
+                args=(child_conn, proc_root),
+                name=f"elpm-scan-{index}",
+                daemon=True,
+            )
+            worker.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.workers.append(worker)
+
+    def scan(self, pids: Optional[List[int]] = None) -> List[ProcessModel]:
+        """Scan the given PIDs (all PIDs by default) across the workers.
+
+        Raises OSError or EOFError if a worker died; the caller should
+        close the scanner and fall back to a single-process scan.
+        """
+        if pids is None:
+            pids = list_pids(self.proc_root)
+
+        count = len(self.connections)
+        shards = [[] for _ in range(count)]
+        for pid in pids:
+            shards[pid % count].append(pid)
+
+        # All workers scan concurrently; results are merged in shard order
+        for conn, shard in zip(self.connections, shards):
+            conn.send(shard)
+
+        processes = []
+        for conn in self.connections:
+            processes.extend(ProcessModel(*row) for row in conn.recv())
+        return processes
+
+    def close(self):
+        """Stop the workers"""
+        for conn in self.connections:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+        for worker in self.workers:
+            worker.join(timeout=1.0)
+            if worker.is_alive():
+                worker.terminate()
+        self.connections = []
+        self.workers = []
@@ -0,0 +1,268 @@
+"""
+Out-of-process collector - scans processes in a child interpreter and hands
+the result to the GUI process through a shared-memory ring buffer.
+
+The child packs every scan into a ProcessColumns table and copies its
+structured array and interned string table into the next slot of a
+multiprocessing.shared_memory ring; only a tiny request/ack goes over a
+pipe, so process lists are never pickled. Each slot is framed by a
+begin/end sequence number (a seqlock), and the buffer header holds the
+sequence of the last complete slot, so a reader can always tell whether
+the slot it mapped holds a complete, current snapshot. The reader takes
+the records with one bulk copy out of the slot (the writer reuses it a few
+scans later) and decodes the string table once; no per-process objects
+are built.
+
+A scan that does not fit a slot is never published in part: the child
+reports the size it needs and the parent replaces the ring with a larger
+one.
+
+Layout:
+    header  Q latest sequence
+    slot    Q begin seq, Q end seq, I record count, I string count,
+            I string table bytes, records[capacity] (PROCESS_DTYPE),
+            I string lengths[capacity * STRINGS_PER_RECORD], string table
+"""
+
+import multiprocessing
+import struct
+from itertools import accumulate
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from models.columnar import PROCESS_DTYPE, STRING_FIELDS, ProcessColumns
+
+HEADER = struct.Struct("=Q")
+SLOT_HEADER = struct.Struct("=QQIII")
+LENGTH = np.dtype(np.uint32)
+
+# Every record holds at most this many distinct strings
+STRINGS_PER_RECORD = len(STRING_FIELDS)
+
+DEFAULT_CAPACITY = 65536
+STRING_BYTES_PER_RECORD = 160
+SLOTS = 3
+
+# Room added whenever the ring has to grow
+GROWTH = 1.25
+
+
+class RingFull(Exception):
+    """Raised by SnapshotRing.write for a snapshot larger than a slot"""
+
+    def __init__(self, records: int, table_bytes: int):
+        super().__init__(f"{records} records, {table_bytes} string bytes")
+        self.records = records
+        self.table_bytes = table_bytes
+
+
+class SnapshotRing:
+    """Shared-memory ring of fixed-layout process snapshots"""
+
+    def __init__(self, name: Optional[str] = None, capacity: int = DEFAULT_CAPACITY,
+                 strings_size: Optional[int] = None, slots: int = SLOTS):
+        self.capacity = capacity
+        self.slots = slots
+        self.strings_size = strings_size if strings_size is not None else capacity * STRING_BYTES_PER_RECORD
+        self.records_size = capacity * PROCESS_DTYPE.itemsize
+        self.lengths_size = capacity * STRINGS_PER_RECORD * LENGTH.itemsize
+        self.slot_size = SLOT_HEADER.size + self.records_size + self.lengths_size + self.strings_size
+        size = HEADER.size + slots * self.slot_size
+
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            # Spawned children share the parent's resource tracker, so the
+            # segment stays registered once and is unlinked by the creator
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.buf = self.shm.buf
+        self.last_seq = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def slot_offset(self, seq: int) -> int:
+        return HEADER.size + (seq % self.slots) * self.slot_size
+
+    def regions(self, base: int) -> Tuple[int, int, int]:
+        """Offsets of the records, string lengths and string table of the slot at base"""
+        records = base + SLOT_HEADER.size
+        lengths = records + self.records_size
+        return records, lengths, lengths + self.lengths_size
+
+    def write(self, seq: int, columns: ProcessColumns):
+        """Write a snapshot into the slot for seq and publish it
+
+        Raises RingFull, leaving the published snapshot untouched, if the
+        snapshot does not fit a slot.
+        """
+        strings = columns.strings
+        # String offsets are in characters, so the reader can decode the
+        # table once and slice it
+        table = "".join(strings).encode("utf-8", "surrogatepass")
+        if len(columns) > self.capacity or len(table) > self.strings_size:
+            raise RingFull(len(columns), len(table))
+
+        buf = self.buf
+        base = self.slot_offset(seq)
+        records, lengths, strings_start = self.regions(base)
+        SLOT_HEADER.pack_into(buf, base, seq, 0, 0, 0, 0)
+
+        np.frombuffer(buf, dtype=PROCESS_DTYPE, count=len(columns), offset=records)[:] = columns.data
+        sizes = np.fromiter(map(len, strings), dtype=LENGTH, count=len(strings)).tobytes()
+        buf[lengths:lengths + len(sizes)] = sizes
+        buf[strings_start:strings_start + len(table)] = table
+
+        SLOT_HEADER.pack_into(buf, base, seq, seq, len(columns), len(strings), len(table))
+        HEADER.pack_into(buf, 0, seq)
+
+    def latest_seq(self) -> int:
+        """Sequence number of the last complete snapshot (0 = none yet)"""
+        return HEADER.unpack_from(self.buf, 0)[0]
+
+    def read(self) -> Optional[ProcessColumns]:
+        """Map the latest complete snapshot as columns, or None if it is being overwritten"""
+        seq = self.latest_seq()
+        if not seq:
+            return None
+        buf = self.buf
+        base = self.slot_offset(seq)
+        begin, end, count, string_count, table_size = SLOT_HEADER.unpack_from(buf, base)
+        if begin != seq or end != seq:
+            return None
+        if (count > self.capacity or string_count > count * STRINGS_PER_RECORD
+                or table_size > self.strings_size):
+            return None
+
+        records, lengths, strings_start = self.regions(base)
+        data = np.frombuffer(buf, dtype=PROCESS_DTYPE, count=count, offset=records).copy()
+        sizes = np.frombuffer(buf, dtype=LENGTH, count=string_count, offset=lengths).tolist()
+        table = str(buf[strings_start:strings_start + table_size], "utf-8", "surrogatepass")
+
+        # The writer may have lapped the ring while we copied
+        if SLOT_HEADER.unpack_from(buf, base)[0] != seq:
+            return None
+        ends = list(accumulate(sizes))
+        strings = [table[start:stop] for start, stop in zip([0] + ends[:-1], ends)]
+        self.last_seq = seq
+        return ProcessColumns(data, strings)
+
+    def close(self):
+        """Unmap the ring (and remove it, in the creating process)"""
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def run_collector(conn, ring_name: str, capacity: int, strings_size: int):
+    """Child process loop: scan on every request and publish into the ring
+
+    Requests are True (scan), None (stop) or ("ring", name, capacity,
+    strings_size) to switch to a larger ring. A scan is answered with its
+    sequence number, or ("full", records, string bytes) if it did not fit.
+    """
+    from models.process_model import get_local_processes
+
+    ring = SnapshotRing(ring_name, capacity, strings_size)
+    seq = 0
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if request is None:
+            break
+        if isinstance(request, tuple):
+            _, name, capacity, strings_size = request
+            ring.close()
+            ring = SnapshotRing(name, capacity, strings_size)
+            conn.send("ring")
+            continue
+        try:
+            ring.write(seq + 1, ProcessColumns.from_processes(get_local_processes()))
+        except RingFull as full:
+            conn.send(("full", full.records, full.table_bytes))
+            continue
+        seq += 1
+        conn.send(seq)
+    ring.close()
+    conn.close()
+
+
+class CollectorProcess:
+    """Handle to the collector child process and its snapshot ring"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.ring = SnapshotRing(capacity=capacity)
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=run_collector,
+            args=(child_conn, self.ring.name, capacity, self.ring.strings_size),
+            name="elpm-collector",
+            daemon=True,
+        )
+        try:
+            self.process.start()
+        except BaseException:
+            self.ring.close()
+            raise
+        finally:
+            child_conn.close()
+
+    def request(self, message, timeout: float):
+        """Send a request to the child and return its reply"""
+        self.conn.send(message)
+        if not self.conn.poll(timeout):
+            raise OSError("collector process did not respond")
+        return self.conn.recv()
+
+    def collect(self, timeout: float = 30.0) -> ProcessColumns:
+        """Ask the child for a fresh scan and read it from shared memory.
+
+        A scan too large for the ring makes the ring grow and is retried.
+        Raises OSError or EOFError if the child is gone or unresponsive.
+        """
+        for _attempt in range(3):
+            reply = self.request(True, timeout)
+            if isinstance(reply, tuple):
+                _, records, table_bytes = reply
+                self.grow(records, table_bytes, timeout)
+                continue
+            columns = self.ring.read()
+            if columns is None:
+                raise OSError("snapshot was overwritten while reading")
+            return columns
+        raise OSError("snapshot does not fit the shared-memory ring")
+
+    def grow(self, records: int, table_bytes: int, timeout: float):
+        """Replace the ring with one that holds records processes and table_bytes of strings"""
+        ring = SnapshotRing(
+            capacity=max(self.ring.capacity, int(records * GROWTH)),
+            strings_size=max(self.ring.strings_size, int(table_bytes * GROWTH)),
+        )
+        try:
+            self.request(("ring", ring.name, ring.capacity, ring.strings_size), timeout)
+        except BaseException:
+            ring.close()
+            raise
+        self.ring.close()
+        self.ring = ring
+
+    def close(self):
+        """Stop the child and release the ring"""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.conn.close()
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.close()
@@ -0,0 +1,143 @@
+"""
+Immutable system snapshots published by the snapshot service
+"""
+
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from models.columnar import ProcessColumns, ProcessRow
+from models.diff import ProcessKey, SnapshotDiff, diff_columns, index_columns
+from models import procfs
+from models.process_model import (ProcessDetails, get_network_connections,
+                                  get_network_interfaces, get_process_columns,
+                                  get_process_details, get_system_stats)
+from models.sockets import build_socket_index
+
+
+@dataclass(frozen=True)
+class SystemSnapshot:
+    """Read-only view of processes, system counters and sockets at one point in time"""
+    seq: int
+    timestamp: float
+    processes: ProcessColumns  # Sequence of ProcessModel-compatible rows
+    system: Dict[str, Any]
+    interfaces: Dict[str, Any]
+    connections: Tuple[Dict[str, Any], ...]
+    collect_time: float  # Seconds spent collecting this snapshot
+    index: Dict[ProcessKey, int]  # (pid, create_time) -> row in processes
+    diff: Optional[SnapshotDiff]  # Changes since the previous snapshot
+    conn_counts: Optional[Dict[int, int]]  # PID -> inet connections (procfs only)
+    sockets: bool = True  # False when connections were skipped (no view showed them)
+    namespaces: Optional[Dict[int, int]] = None  # PID -> PID namespace id (procfs only)
+    # Expensive fields fetched on demand, cached for the lifetime of the snapshot
+    details: Dict[int, Optional[ProcessDetails]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def process(self, key: ProcessKey) -> Optional[ProcessRow]:
+        """Return the process with the given identity key, if present"""
+        position = self.index.get(key)
+        return None if position is None else self.processes[position]
+
+    def get_details(self, pid: int) -> Optional[ProcessDetails]:
+        """Return the expensive fields of pid, collecting them on first use"""
+        if pid not in self.details:
+            details = get_process_details(pid)
+            if details is not None and self.conn_counts is not None:
+                details = replace(details, network_conns=self.conn_counts.get(pid, 0))
+            self.details[pid] = details
+        return self.details[pid]
+
+
+def collect_system_snapshot(seq: int, previous: SystemSnapshot) -> SystemSnapshot:
+    """Refresh only the system counters, reusing the processes and sockets of previous
+
+    Used while nothing but the graph history needs fresh data (e.g. the
+    window is minimized); the diff is empty since no processes were read.
+    """
+    started = time.perf_counter()
+    return replace(
+        previous,
+        seq=seq,
+        timestamp=time.time(),
+        system=get_system_stats(cpu_interval=None),
+        collect_time=time.perf_counter() - started,
+        diff=SnapshotDiff(added=(), exited=(), changed={}),
+        details={},
+    )
+
+
+def collect_snapshot(
+    seq: int,
+    previous: Optional[SystemSnapshot] = None,
+    connection_states: Optional[FrozenSet[str]] = None,
+    sockets: bool = True,
+) -> SystemSnapshot:
+    """Collect a new snapshot of processes, system counters and sockets
+
+    When the previous snapshot is given, the result carries the diff
+    against it so consumers can apply O(changes) updates.
+    connection_states limits the collected connections to those states
+    (e.g. {"LISTEN"}); the filter is applied in the kernel when netlink is
+    available. Per-process connection counts are only derived from an
+    unfiltered collection. With sockets False the socket tables and the
+    /proc/*/fd owner walk are skipped altogether; process details then
+    count their sockets on demand.
+    """
+    started = time.perf_counter()
+    processes = get_process_columns()
+    names = dict(zip(processes.column("pid").tolist(), processes.string_column("name").tolist()))
+    index = index_columns(processes)
+    if previous is not None:
+        diff = diff_columns(previous.processes, previous.index, processes, index)
+    else:
+        diff = None
+
+    # One socket-table parse and fd walk serves both connection owners
+    # and per-process connection counts
+    if not sockets:
+        connections = []
+        conn_counts = None
+    elif procfs.is_available():
+        socket_index = build_socket_index(names.keys(), states=connection_states)
+        connections = socket_index.connections(names)
+        conn_counts = None if connection_states else socket_index.connection_counts()
+    else:
+        connections = get_network_connections(names)
+        if connection_states:
+            connections = [c for c in connections if c['status'] in connection_states]
+        conn_counts = None
+
+    return SystemSnapshot(
+        seq=seq,
+        timestamp=time.time(),
+        processes=processes,
+        system=get_system_stats(cpu_interval=None),
+        interfaces=get_network_interfaces(),
+        connections=tuple(connections),
+        collect_time=time.perf_counter() - started,
+        index=index,
+        diff=diff,
+        conn_counts=conn_counts,
+        sockets=sockets,
+        namespaces=pid_namespaces(processes, previous, diff),
+    )
+
+
+def pid_namespaces(processes: ProcessColumns, previous: Optional[SystemSnapshot],
+                   diff: Optional[SnapshotDiff]) -> Optional[Dict[int, int]]:
+    """PID namespace of every process, read only for processes new since previous
+
+    A process never changes its PID namespace, so the previous snapshot's
+    entries are carried over for the processes that are still running.
+    """
+    if not procfs.is_available():
+        return None
+    if previous is None or diff is None or previous.namespaces is None:
+        return procfs.read_pid_namespaces(processes.column("pid").tolist())
+    namespaces = dict(previous.namespaces)
+    for pid, _create_time in diff.exited:
+        namespaces.pop(pid, None)
+    namespaces.update(procfs.read_pid_namespaces(pid for pid, _create_time in diff.added))
+    return namespaces
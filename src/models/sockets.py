@@ -0,0 +1,245 @@
+"""
+Socket index - parses /proc/net/{tcp,tcp6,udp,udp6,unix} once and maps
+socket inodes to their owning PIDs with a single /proc/*/fd walk.
+
+Per-process connection counts and connection -> process names both come
+from the same O(sockets + fds) structure instead of one psutil call per
+process or per connection.
+"""
+
+import os
+import socket
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models.procfs import PROC_ROOT
+
+# Kernel TCP states (include/net/tcp_states.h), named like psutil reports them
+TCP_STATES = {
+    "01": "ESTABLISHED",
+    "02": "SYN_SENT",
+    "03": "SYN_RECV",
+    "04": "FIN_WAIT1",
+    "05": "FIN_WAIT2",
+    "06": "TIME_WAIT",
+    "07": "CLOSE",
+    "08": "CLOSE_WAIT",
+    "09": "LAST_ACK",
+    "0A": "LISTEN",
+    "0B": "CLOSING",
+    "0C": "SYN_RECV",  # TCP_NEW_SYN_RECV
+}
+
+# /proc/net table -> (protocol label, address family)
+INET_TABLES = {
+    "tcp": ("TCP", socket.AF_INET),
+    "tcp6": ("TCP", socket.AF_INET6),
+    "udp": ("UDP", socket.AF_INET),
+    "udp6": ("UDP", socket.AF_INET6),
+}
+INET_KINDS = tuple(INET_TABLES)
+ALL_KINDS = INET_KINDS + ("unix",)
+
+SOCKET_PREFIX = "socket:["
+
+
+@dataclass
+class SocketEntry:
+    """One socket from a /proc/net table"""
+    protocol: str  # TCP, UDP or UNIX
+    family: int
+    local: str  # "ip:port", a unix path, or "N/A"
+    remote: str
+    status: str
+    inode: int
+
+    def key(self) -> Tuple[str, str, str, int]:
+        """Identity of the socket: the 5-tuple plus inode"""
+        return (self.protocol, self.local, self.remote, self.inode)
+
+
+def decode_address(value: str, family: int) -> str:
+    """Decode a hex "ADDR:PORT" from /proc/net into "ip:port" ("N/A" for port 0)"""
+    ip_hex, port_hex = value.split(":")
+    port = int(port_hex, 16)
+    if not port:
+        return "N/A"
+
+    packed = bytes.fromhex(ip_hex)
+    if sys.byteorder == "little":
+        # The kernel prints each 32-bit word in host byte order
+        packed = b"".join(packed[i:i + 4][::-1] for i in range(0, len(packed), 4))
+    return f"{socket.inet_ntop(family, packed)}:{port}"
+
+
+def parse_inet_table(path: str, protocol: str, family: int) -> List[SocketEntry]:
+    """Parse one of /proc/net/{tcp,tcp6,udp,udp6}"""
+    entries = []
+    try:
+        with open(path) as f:
+            next(f, None)  # Header
+            for line in f:
+                fields = line.split()
+                if len(fields) < 10:
+                    continue
+                if protocol == "TCP":
+                    status = TCP_STATES.get(fields[3], "NONE")
+                else:
+                    status = "NONE"
+                entries.append(SocketEntry(
+                    protocol=protocol,
+                    family=family,
+                    local=decode_address(fields[1], family),
+                    remote=decode_address(fields[2], family),
+                    status=status,
+                    inode=int(fields[9]),
+                ))
+    except OSError:
+        pass
+    return entries
+
+
+def parse_unix_table(path: str) -> List[SocketEntry]:
+    """Parse /proc/net/unix"""
+    entries = []
+    try:
+        with open(path) as f:
+            next(f, None)  # Header
+            for line in f:
+                fields = line.split()
+                if len(fields) < 7:
+                    continue
+                entries.append(SocketEntry(
+                    protocol="UNIX",
+                    family=socket.AF_UNIX,
+                    local=fields[7] if len(fields) > 7 else "N/A",
+                    remote="N/A",
+                    status="NONE",
+                    inode=int(fields[6]),
+                ))
+    except OSError:
+        pass
+    return entries
+
+
+def read_socket_tables(
+    proc_root: str = PROC_ROOT,
+    kinds: Iterable[str] = INET_KINDS,
+    states: Optional[Iterable[str]] = None,
+    use_netlink: bool = True,
+) -> List[SocketEntry]:
+    """Read the requested socket tables once.
+
+    inet sockets come from NETLINK_SOCK_DIAG when available, with the
+    state filter applied in the kernel; anything netlink cannot serve
+    falls back to parsing /proc/net. states limits the result to sockets
+    in those states (None = all).
+    """
+    states = set(states) if states else None
+    sockets = []
+    pending = list(kinds)
+
+    if use_netlink and proc_root == PROC_ROOT:
+        from models import netlink
+
+        if netlink.is_available():
+            inet_kinds = [kind for kind in pending if kind in INET_TABLES]
+            entries, failed = netlink.collect_sockets(inet_kinds, states)
+            sockets.extend(entries)
+            pending = [kind for kind in pending if kind not in inet_kinds or kind in failed]
+
+    for kind in pending:
+        path = f"{proc_root}/net/{kind}"
+        if kind == "unix":
+            entries = parse_unix_table(path)
+        else:
+            protocol, family = INET_TABLES[kind]
+            entries = parse_inet_table(path, protocol, family)
+        if states:
+            entries = [entry for entry in entries if entry.status in states]
+        sockets.extend(entries)
+    return sockets
+
+
+def map_socket_owners(pids: Iterable[int], inodes, proc_root: str = PROC_ROOT) -> Dict[int, int]:
+    """Walk /proc/[pid]/fd once and map socket inodes to their owning PID.
+
+    Only inodes in the given set are recorded. Processes whose fd directory
+    cannot be read (other users without privileges) are skipped.
+    """
+    owners = {}
+    prefix_len = len(SOCKET_PREFIX)
+    for pid in pids:
+        fd_dir = f"{proc_root}/{pid}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                target = os.readlink(f"{fd_dir}/{fd}")
+            except OSError:
+                continue
+            if target.startswith(SOCKET_PREFIX):
+                inode = int(target[prefix_len:-1])
+                if inode in inodes:
+                    owners.setdefault(inode, pid)
+    return owners
+
+
+class SocketIndex:
+    """Sockets of one tick together with their owning PIDs"""
+
+    def __init__(self, sockets: List[SocketEntry], owners: Dict[int, int]):
+        self.sockets = sockets
+        self.owners = owners
+
+    def owner(self, entry: SocketEntry) -> int:
+        """PID owning a socket, or 0 if unknown"""
+        return self.owners.get(entry.inode, 0)
+
+    def connection_counts(self) -> Dict[int, int]:
+        """Number of inet connections per PID"""
+        counts: Dict[int, int] = {}
+        owners = self.owners
+        for entry in self.sockets:
+            if entry.protocol == "UNIX":
+                continue
+            pid = owners.get(entry.inode)
+            if pid:
+                counts[pid] = counts.get(pid, 0) + 1
+        return counts
+
+    def connections(self, names: Optional[Dict[int, str]] = None) -> List[dict]:
+        """Inet connections in the format of get_network_connections()"""
+        names = names or {}
+        owners = self.owners
+        connections = []
+        for entry in self.sockets:
+            if entry.protocol == "UNIX":
+                continue
+            pid = owners.get(entry.inode, 0)
+            connections.append({
+                'pid': pid,
+                'process': names.get(pid, "N/A") if pid else "N/A",
+                'protocol': entry.protocol,
+                'local': entry.local,
+                'remote': entry.remote,
+                'status': entry.status,
+                'inode': entry.inode,
+            })
+        return connections
+
+
+def build_socket_index(
+    pids: Iterable[int],
+    proc_root: str = PROC_ROOT,
+    kinds: Iterable[str] = INET_KINDS,
+    states: Optional[Iterable[str]] = None,
+) -> SocketIndex:
+    """Build the socket index for one tick in O(sockets + fds)"""
+    sockets = read_socket_tables(proc_root, kinds, states)
+    inodes = {entry.inode for entry in sockets if entry.inode}
+    owners = map_socket_owners(pids, inodes, proc_root) if inodes else {}
+    return SocketIndex(sockets, owners)
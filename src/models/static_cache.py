@@ -0,0 +1,78 @@
+"""
+Static-attribute cache - remembers the attributes of a live process that
+(almost) never change, so collectors can skip re-reading and re-formatting them
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Set
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StaticInfo:
+    """Attributes that stay fixed for the lifetime of a process"""
+    name: str
+    command: str
+    user: str
+    created: str
+
+
+class StaticCache:
+    """Cache of StaticInfo keyed on (pid, start time).
+
+    An entry is only trusted while the key matches (so a reused PID never
+    hits a stale entry) and the process name is unchanged (an exec changes
+    it). Entries are also refreshed after max_age seconds, which picks up
+    processes that rewrite their command line or switch user.
+
+    Entries of exited processes are dropped by retain(). Between two
+    retain() calls, max_entries caps how many entries beyond the processes
+    live at the last one are kept, which bounds memory on hosts with heavy
+    PID churn; the least recently used entries go first, so a scan never
+    evicts processes it is about to look up, however many there are.
+    """
+
+    def __init__(self, max_entries: int = 32768, max_age: float = 60.0):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.live = 0  # Processes present at the last retain()
+        self.entries: Dict[Hashable, Tuple[StaticInfo, float]] = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: Hashable, name: str, now: Optional[float] = None) -> Optional[StaticInfo]:
+        """Return the cached info for key, or None if missing or stale"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        info, stored = entry
+        if now is None:
+            now = time.monotonic()
+        if info.name != name or now - stored > self.max_age:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return info
+
+    def put(self, key: Hashable, info: StaticInfo, now: Optional[float] = None):
+        """Store info for key, evicting the least recently used entries beyond the cap"""
+        self.entries[key] = (info, time.monotonic() if now is None else now)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.live + self.max_entries:
+            self.entries.popitem(last=False)
+
+    def retain(self, keys: Iterable[Hashable]):
+        """Drop the entries of processes that are no longer present"""
+        live = keys if isinstance(keys, (Set, dict)) else set(keys)
+        for key in [key for key in self.entries if key not in live]:
+            del self.entries[key]
+        self.live = len(live)
+
+    def clear(self):
+        """Remove all entries"""
+        self.entries.clear()